@@ -0,0 +1,152 @@
+# admission.py
+# 🚦 ADMISSION CONTROL FOR QUANTUM SIMULATION REQUESTS
+#
+# Keeps a single client from saturating every worker:
+# - Per-client token buckets limit the request rate (429 + Retry-After)
+# - A global in-flight cap with a short bounded wait queue limits concurrent
+#   simulations; when the queue is full requests are shed at once (503 + Retry-After)
+#   instead of piling up until the client times out.
+
+from collections import OrderedDict
+import math
+import threading
+import time
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second up to `capacity`."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now):
+        """
+        Take one token.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class RateLimiter:
+    """Per-client token buckets; the least recently seen clients are forgotten first."""
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.limited = 0
+
+    def check(self, client_id):
+        """Return 0 if the client may proceed, otherwise the seconds to wait."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst, now)
+                self._buckets[client_id] = bucket
+                while len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client_id)
+            wait = bucket.take(now)
+            if wait > 0:
+                self.limited += 1
+            return wait
+
+    def stats(self):
+        with self._lock:
+            return {
+                'rate_per_second': self.rate,
+                'burst': self.burst,
+                'tracked_clients': len(self._buckets),
+                'rate_limited': self.limited
+            }
+
+class AdmissionController:
+    """Global cap on concurrent simulations with a bounded, time-limited wait queue."""
+
+    def __init__(self, max_in_flight, max_queue, queue_timeout):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    def acquire(self):
+        """
+        Try to claim a simulation slot, waiting in the queue if there is room.
+
+        Returns:
+            bool: True if admitted; the caller must then call release()
+        """
+        with self._condition:
+            if self.in_flight >= self.max_in_flight:
+                if self.waiting >= self.max_queue:
+                    self.shed_queue_full += 1
+                    return False
+
+                self.waiting += 1
+                self.queued += 1
+                deadline = time.monotonic() + self.queue_timeout
+                try:
+                    while self.in_flight >= self.max_in_flight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.shed_timeout += 1
+                            return False
+                        self._condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def try_acquire(self):
+        """Claim a slot only if one is free right now, never queueing (for background work)."""
+        with self._condition:
+            if self.in_flight >= self.max_in_flight or self.waiting > 0:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def retry_after(self):
+        """Seconds a shed client should wait before retrying (at least 1)."""
+        return max(1, math.ceil(self.queue_timeout))
+
+    def stats(self):
+        with self._condition:
+            return {
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'waiting': self.waiting,
+                'max_queue': self.max_queue,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'shed_queue_full': self.shed_queue_full,
+                'shed_timeout': self.shed_timeout
+            }
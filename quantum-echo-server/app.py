@@ -1,21 +1,42 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 from qiskit import QuantumCircuit, transpile
 from qiskit.quantum_info import Statevector
 from qiskit_aer import AerSimulator
 from enum import Enum
+from collections import OrderedDict
+from functools import wraps
 import numpy as np
+import hashlib
+import os
 import random
+import re
 import string
 import math
+import threading
+import time
+
+from admission import AdmissionController, RateLimiter
+from noise_channels import MEMORY_TYPE_CHANNELS, NOISE_CHANNELS, apply_noise_transformation, get_noise_stats
+from prefetch import Prefetcher
+from session_store import SessionStore, validate_session_id
+from snapshot import SnapshotStore
+
+# Persistent WebSocket channel (optional: needs the websockets package)
+try:
+    from ws_server import WebSocketChannel
+except ImportError:
+    print("Warning: websockets not installed. WebSocket channel disabled.")
+    WebSocketChannel = None
 
 # Import quantum word dictionary
 try:
-    from quantum_word_dictionary import get_quantum_category_for_word, analyze_text_coverage
+    from quantum_word_dictionary import (get_quantum_category_for_word, analyze_text_coverage,
+                                         get_active_lexicon, get_lexicon_info, start_lexicon_watcher)
 except ImportError:
     print("Warning: quantum_word_dictionary.py not found. Using fallback categorization.")
     
-    def get_quantum_category_for_word(word):
+    def get_quantum_category_for_word(word, lexicon=None):
         """Fallback categorization if dictionary not available - MODERATE COVERAGE!"""
         word_lower = word.lower()
         
@@ -51,22 +72,54 @@ except ImportError:
     def analyze_text_coverage(text):
         """Fallback analysis"""
         return {'message': 'Using fallback categorization - install quantum_word_dictionary.py for full coverage'}
+    
+    def get_active_lexicon():
+        return None
+    
+    def get_lexicon_info():
+        return {'version': 'fallback'}
+    
+    def start_lexicon_watcher():
+        return None
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for cross-origin requests from web games
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('QUANTUM_MAX_BODY_BYTES', 64 * 1024))
+
+# Hot-reload quantum_lexicon.json without restarting workers (set QUANTUM_LEXICON_WATCH=0 to disable)
+if os.environ.get('QUANTUM_LEXICON_WATCH', '1') != '0':
+    start_lexicon_watcher()
 
 # Quantum gate types
 class GateType(Enum):
     BIT_FLIP = 1
     PHASE_FLIP = 2
     ROTATE_Y = 3
+    HADAMARD = 4
+    CNOT = 5
+    CZ = 6
+    SWAP = 7
+
+# Gates that act on a control and a target qubit
+TWO_QUBIT_GATES = [GateType.CNOT, GateType.CZ, GateType.SWAP]
+
+# Names accepted in /quantum_gate sequences
+GATE_NAMES = {
+    'bit_flip': GateType.BIT_FLIP, 'x': GateType.BIT_FLIP,
+    'phase_flip': GateType.PHASE_FLIP, 'z': GateType.PHASE_FLIP,
+    'rotation': GateType.ROTATE_Y, 'ry': GateType.ROTATE_Y,
+    'hadamard': GateType.HADAMARD, 'h': GateType.HADAMARD,
+    'cnot': GateType.CNOT, 'cx': GateType.CNOT,
+    'cz': GateType.CZ,
+    'swap': GateType.SWAP
+}
 
 class Qubit:
     """Represents a single qubit with superposition amplitudes using qiskit."""
     
-    def __init__(self):
-        # Start in |0> state, amplitudes alpha=1, beta=0
-        self.state = Statevector([1, 0])
+    def __init__(self, initial_state=None):
+        # Start in |0> state (alpha=1, beta=0) unless a session state is given
+        self.state = Statevector(initial_state if initial_state is not None else [1, 0])
     
     def bit_flip(self):
         # Apply X gate (bit flip)
@@ -116,13 +169,21 @@ class QuantumGate:
         self.gate_type = gate_type
         self.rotation_angle = rotation_angle
 
-    def apply_to(self, qc: QuantumCircuit, qubit_index: int):
+    def apply_to(self, qc: QuantumCircuit, qubit_index: int, control_index: int = None):
         if self.gate_type == GateType.BIT_FLIP:
             qc.x(qubit_index)
         elif self.gate_type == GateType.PHASE_FLIP:
             qc.z(qubit_index)
         elif self.gate_type == GateType.ROTATE_Y:
             qc.ry(self.rotation_angle, qubit_index)
+        elif self.gate_type == GateType.HADAMARD:
+            qc.h(qubit_index)
+        elif self.gate_type == GateType.CNOT:
+            qc.cx(control_index, qubit_index)
+        elif self.gate_type == GateType.CZ:
+            qc.cz(control_index, qubit_index)
+        elif self.gate_type == GateType.SWAP:
+            qc.swap(control_index, qubit_index)
 
 class QuantumCircuitManager:
     """Manages quantum circuit operations."""
@@ -151,16 +212,74 @@ class QuantumCircuitManager:
         statevector = result.get_statevector()
         return statevector
 
+# Transformation engine selection
+BASIC_CATEGORIES = ['scramble', 'reverse', 'ghost', 'quantum_caps']
+ADVANCED_CATEGORIES = ['quantum_entanglement', 'quantum_gates', 'quantum_interference']
+NOISE_CATEGORIES = ['quantum_decoherence']
+MAX_ADVANCED_QUBITS = 8
+
+# Decoherence effects (cached noise channel tables, see noise_channels.py)
+DEFAULT_NOISE_CHANNEL = 'amplitude_damping'
+DEFAULT_NOISE_INTENSITY = float(os.environ.get('QUANTUM_NOISE_INTENSITY', 0.5))
+
+# Number of per-text transformation plans kept in memory
+PLAN_CACHE_SIZE = int(os.environ.get('QUANTUM_PLAN_CACHE_SIZE', 1024))
+
+# Per-player quantum registers (optional 'session_id' in requests)
+SESSION_QUBITS = int(os.environ.get('QUANTUM_SESSION_QUBITS', 2))
+SESSION_MAX_COUNT = int(os.environ.get('QUANTUM_SESSION_MAX', 10000))
+SESSION_TTL_SECONDS = float(os.environ.get('QUANTUM_SESSION_TTL_SECONDS', 1800))
+SESSION_MAX_BYTES = int(os.environ.get('QUANTUM_SESSION_MAX_BYTES', 8 * 1024 * 1024))
+SESSION_TEXT_ROTATION = math.pi / 8  # Ry angle applied per fully-quantum text
+
+# Limits for multi-gate /quantum_gate sequences
+MAX_SEQUENCE_QUBITS = int(os.environ.get('QUANTUM_MAX_SEQUENCE_QUBITS', 5))
+MAX_SEQUENCE_GATES = int(os.environ.get('QUANTUM_MAX_SEQUENCE_GATES', 64))
+MAX_SHOTS = int(os.environ.get('QUANTUM_MAX_SHOTS', 4096))
+
+# Admission control: request size, per-client rate and global concurrency limits
+MAX_TEXT_CHARS = int(os.environ.get('QUANTUM_MAX_TEXT_CHARS', 2000))
+MAX_TEXT_WORDS = int(os.environ.get('QUANTUM_MAX_TEXT_WORDS', 300))
+RATE_LIMIT_PER_SECOND = float(os.environ.get('QUANTUM_RATE_LIMIT_PER_SECOND', 5))
+RATE_LIMIT_BURST = float(os.environ.get('QUANTUM_RATE_LIMIT_BURST', 10))
+MAX_IN_FLIGHT = int(os.environ.get('QUANTUM_MAX_IN_FLIGHT', 4))
+MAX_QUEUE = int(os.environ.get('QUANTUM_MAX_QUEUE', 16))
+QUEUE_TIMEOUT_SECONDS = float(os.environ.get('QUANTUM_QUEUE_TIMEOUT_SECONDS', 2.0))
+TRUST_PROXY = os.environ.get('QUANTUM_TRUST_PROXY', '0') == '1'
+
+# Speculative prefetch of upcoming dialogue (POST /prefetch)
+PREFETCH_MAX_QUEUE = int(os.environ.get('QUANTUM_PREFETCH_MAX_QUEUE', 256))
+PREFETCH_MAX_RESULTS = int(os.environ.get('QUANTUM_PREFETCH_MAX_RESULTS', 512))
+PREFETCH_MAX_TEXTS = int(os.environ.get('QUANTUM_PREFETCH_MAX_TEXTS', 64))
+PREFETCH_DEFAULT_DEPTH = 2
+
+# WebSocket channel (QUANTUM_WS_PORT=0 disables it)
+WS_HOST = os.environ.get('QUANTUM_WS_HOST', '0.0.0.0')
+WS_PORT = int(os.environ.get('QUANTUM_WS_PORT', 8001))
+
+# Warm-start snapshot of the statevector and plan caches (off unless QUANTUM_SNAPSHOT_PATH is set)
+SNAPSHOT_PATH = os.environ.get('QUANTUM_SNAPSHOT_PATH', '')
+SNAPSHOT_INTERVAL_SECONDS = float(os.environ.get('QUANTUM_SNAPSHOT_INTERVAL_SECONDS', 300))
+
+# Latency budget for /quantum_text (overridable per request with X-Latency-Budget-Ms)
+DEFAULT_LATENCY_BUDGET_MS = float(os.environ.get('QUANTUM_LATENCY_BUDGET_MS', 1500))
+MAX_LATENCY_BUDGET_MS = float(os.environ.get('QUANTUM_MAX_LATENCY_BUDGET_MS', 10000))
+BUDGET_DEGRADE_FRACTION = 0.5   # evaluate uncached advanced circuits with Statevector instead of Aer
+BUDGET_GIVE_UP_FRACTION = 0.9   # leave the remaining words original
+
 # Helper functions for quantum transformations (condensed)
-def apply_basic_transformation(text, category):
-    """Apply basic quantum transformations using individual qubits."""
+def apply_basic_transformation(text, category, initial_state=None):
+    """
+    Apply basic quantum transformations using individual qubits.
+    Each qubit starts in initial_state (a player's session state) or |0>.
+    """
     result = ""
     for char in text:
         if not char.isalpha():
             result += char
             continue
         
-        qubit = Qubit()
+        qubit = Qubit(initial_state)
         
         # Initialize based on character
         if char.isupper():
@@ -183,12 +302,8 @@ def apply_basic_transformation(text, category):
     
     return result
 
-def apply_advanced_transformation(text, category):
-    """Apply advanced quantum transformations using multi-qubit circuits."""
-    if len(text) < 2:
-        return text
-    
-    num_qubits = min(len(text), 8)
+def build_advanced_circuit(num_qubits, category):
+    """Build the multi-qubit circuit used by the advanced transformation of a category."""
     qc_manager = QuantumCircuitManager(num_qubits)
     
     # Apply gates based on category
@@ -202,8 +317,50 @@ def apply_advanced_transformation(text, category):
             gate = QuantumGate(gate_type, math.pi/4 if gate_type == GateType.ROTATE_Y else 0)
             qc_manager.apply_gate_to_qubit(gate, i)
     
+    return qc_manager
+
+# Statevectors of the advanced circuits, keyed by (num_qubits, category)
+_advanced_statevectors = {}
+# Moving average of one Aer transpile + run, used to decide whether one still fits a budget
+aer_simulation_ms = 150.0
+
+def get_advanced_statevector(num_qubits, category, analytic=False):
+    """
+    Simulate the advanced circuit for (num_qubits, category) once and reuse it.
+    The circuits contain no randomness, so the statevector only depends on the key.
+    With analytic=True a cache miss is evaluated with get_analytic_statevector
+    instead of Aer; both give the same statevector, so either result is cached.
+    """
+    global aer_simulation_ms
+    key = (num_qubits, category)
+    statevector = _advanced_statevectors.get(key)
+    if statevector is None and analytic:
+        statevector = get_analytic_statevector(num_qubits, category)
+        _advanced_statevectors[key] = statevector
+    elif statevector is None:
+        started = time.perf_counter()
+        statevector = build_advanced_circuit(num_qubits, category).simulate()
+        aer_simulation_ms = 0.8 * aer_simulation_ms + 0.2 * (time.perf_counter() - started) * 1000
+        _advanced_statevectors[key] = statevector
+    return statevector
+
+def get_analytic_statevector(num_qubits, category):
+    """
+    Evaluate an advanced circuit directly with qiskit's Statevector, skipping the
+    Aer transpile and run (about 1 ms instead of over 100 ms). The result is exact,
+    identical to the Aer statevector.
+    """
+    return Statevector.from_instruction(build_advanced_circuit(num_qubits, category).qc)
+
+def apply_advanced_transformation(text, category):
+    """Apply advanced quantum transformations using multi-qubit circuits."""
+    if len(text) < 2:
+        return text
+    
+    num_qubits = min(len(text), MAX_ADVANCED_QUBITS)
+    
     # Get state and transform
-    statevector = qc_manager.simulate()
+    statevector = get_advanced_statevector(num_qubits, category)
     return transform_text_from_statevector(text, statevector)
 
 def transform_char_basic(char, measurement, superposition):
@@ -278,89 +435,619 @@ def transform_text_from_statevector(text, statevector):
 
 def apply_quantum_transformation(text, category):
     """Main dispatcher for quantum transformations."""
-    if category in ['scramble', 'reverse', 'ghost', 'quantum_caps']:
+    if category in BASIC_CATEGORIES:
         return apply_basic_transformation(text, category)
-    elif category in ['quantum_entanglement', 'quantum_gates', 'quantum_interference']:
+    elif category in ADVANCED_CATEGORIES:
         return apply_advanced_transformation(text, category)
+    elif category in NOISE_CATEGORIES:
+        return apply_noise_transformation(text, DEFAULT_NOISE_CHANNEL, DEFAULT_NOISE_INTENSITY)[0]
     else:
         return text
 
-@app.route('/quantum_gate', methods=['POST'])
-def quantum_gate_endpoint():
+class BoundedCache:
+    """Thread-safe LRU cache holding at most max_entries values."""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def items(self):
+        """Copy of the (key, value) pairs, least recently used first."""
+        with self._lock:
+            return list(self._entries.items())
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+class TransformationPlan:
     """
-    Minimal endpoint for quantum gate operations compatible with Godot game logic.
-    Handles bit_flip, phase_flip, and rotation gates.
+    Deterministic part of a /quantum_text request.
+    
+    Tokenization, categorization, word counts and the basic/advanced engine choice
+    only depend on the text, so they are computed once per text and cached. Each
+    token is a (text, engine, category, statevector) tuple; rendering the plan is
+    the only step that draws random numbers.
     """
-    try:
-        print("=" * 50)
-        print("[Flask] QUANTUM GATE REQUEST RECEIVED")
-        print("=" * 50)
+    
+    __slots__ = ('tokens', 'quantum_words', 'total_words')
+    
+    def __init__(self, tokens, quantum_words, total_words):
+        self.tokens = tokens
+        self.quantum_words = quantum_words
+        self.total_words = total_words
+    
+    @property
+    def coverage_percent(self):
+        return (self.quantum_words / self.total_words * 100) if self.total_words > 0 else 0
+
+class LatencyBudget:
+    """Tracks a request's elapsed time against its latency budget."""
+    
+    def __init__(self, budget_ms, started=None):
+        self.budget_ms = budget_ms
+        self.started = started if started is not None else time.perf_counter()
+    
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+    
+    def should_degrade(self, expected_ms=0.0):
+        """True if work expected to take expected_ms would end past the degrade point."""
+        return self.elapsed_ms() + expected_ms >= self.budget_ms * BUDGET_DEGRADE_FRACTION
+    
+    def exhausted(self):
+        """Past this point remaining words are left original."""
+        return self.elapsed_ms() >= self.budget_ms * BUDGET_GIVE_UP_FRACTION
+
+def build_transformation_plan(text, lexicon=None, budget=None):
+    """Tokenize and categorize text, resolving each word to its transformation engine."""
+    tokens = []
+    quantum_words = 0
+    total_words = 0
+    
+    for word in re.findall(r'\b\w+\b|\W+', text):
+        if not word.strip().isalpha():
+            tokens.append((word, 'passthrough', None, None))
+            continue
         
-        data = request.get_json()
-        print(f"[Flask] Raw request data: {data}")
+        total_words += 1
+        category = get_quantum_category_for_word(word, lexicon)
         
-        if not data:
-            print("[Flask] ❌ ERROR: No JSON data received")
-            return jsonify({'error': 'No JSON data provided'}), 400
-            
-        # Handle both 'gate' and 'gate_type' for compatibility
-        gate_type = data.get('gate_type') or data.get('gate')
+        if category in BASIC_CATEGORIES:
+            tokens.append((word, 'basic', category, None))
+        elif category in ADVANCED_CATEGORIES:
+            statevector = None
+            if len(word) >= 2:
+                # When a fresh Aer simulation would not fit the budget, evaluate the circuit directly
+                analytic = budget is not None and budget.should_degrade(aer_simulation_ms)
+                statevector = get_advanced_statevector(min(len(word), MAX_ADVANCED_QUBITS), category, analytic)
+            tokens.append((word, 'advanced', category, statevector))
+        elif category in NOISE_CATEGORIES:
+            tokens.append((word, 'noise', category, None))
+        else:
+            tokens.append((word, 'original', category, None))
         
-        if not gate_type:
-            print("[Flask] ❌ ERROR: Missing gate_type/gate parameter")
-            return jsonify({'error': 'Missing gate_type or gate parameter'}), 400
-            
-        print(f"[Flask] 📡 Gate type received: '{gate_type}'")
+        if category != 'original':
+            quantum_words += 1
+    
+    return TransformationPlan(tokens, quantum_words, total_words)
+
+def render_transformation_plan(plan, initial_state=None, budget=None, memory_noise=None):
+    """
+    Run the stochastic part of a plan, returning freshly transformed text.
+    With memory_noise=(channel, intensity), memory words ('quantum_interference')
+    get the decoherence effect instead of their statevector transform.
+    
+    Returns:
+        tuple: (transformed text, number of degraded words left original because
+                the latency budget ran out)
+    """
+    result = []
+    degraded = 0
+    for word, engine, category, statevector in plan.tokens:
+        if engine in ['basic', 'advanced', 'noise'] and budget is not None and budget.exhausted():
+            result.append(word)
+            degraded += 1
+        elif memory_noise is not None and category == 'quantum_interference':
+            result.append(apply_noise_transformation(word, *memory_noise)[0])
+        elif engine == 'noise':
+            result.append(apply_noise_transformation(word, DEFAULT_NOISE_CHANNEL, DEFAULT_NOISE_INTENSITY)[0])
+        elif engine == 'basic':
+            result.append(apply_basic_transformation(word, category, initial_state))
+        elif engine == 'advanced' and statevector is not None:
+            result.append(transform_text_from_statevector(word, statevector))
+        else:
+            result.append(word)
+    return ''.join(result), degraded
+
+plan_cache = BoundedCache(PLAN_CACHE_SIZE)
+
+session_store = SessionStore(
+    num_qubits=SESSION_QUBITS,
+    max_sessions=SESSION_MAX_COUNT,
+    ttl_seconds=SESSION_TTL_SECONDS,
+    max_bytes=SESSION_MAX_BYTES
+)
+
+def advanced_circuit_fingerprint(num_qubits, category):
+    """Hash of an advanced circuit's instructions; a snapshot statevector is only reused if it matches."""
+    qc = build_advanced_circuit(num_qubits, category).qc
+    instructions = [(inst.operation.name, [qc.find_bit(q).index for q in inst.qubits],
+                     [float(p) for p in inst.operation.params]) for inst in qc.data]
+    return hashlib.sha256(repr(instructions).encode('utf-8')).hexdigest()[:16]
+
+def collect_snapshot():
+    """
+    Snapshot contents: Aer statevectors as arrays, and plans of the current
+    lexicon with their statevectors replaced by references into those arrays.
+    """
+    lexicon_version = getattr(get_active_lexicon(), 'version', 'fallback')
+    arrays = {}
+    statevectors = {}
+    for (num_qubits, category), statevector in list(_advanced_statevectors.items()):
+        name = f'statevector/{num_qubits}/{category}'
+        arrays[name] = np.asarray(statevector.data)
+        statevectors[name] = advanced_circuit_fingerprint(num_qubits, category)
+    
+    plans = []
+    for key, plan in plan_cache.items():
+        if key.startswith(f'{lexicon_version}:'):
+            tokens = [[word, engine, category] for word, engine, category, _ in plan.tokens]
+            plans.append([key, tokens, plan.quantum_words, plan.total_words])
+    
+    document = {
+        'lexicon_version': lexicon_version,
+        'aer_simulation_ms': aer_simulation_ms,
+        'statevectors': statevectors,
+        'plans': plans
+    }
+    return document, arrays
+
+def restore_snapshot(document, arrays):
+    """
+    Refill the caches from a snapshot. Statevectors of circuits that changed and
+    plans of another lexicon version are dropped as stale.
+    """
+    global aer_simulation_ms
+    restored = stale = 0
+    for name, fingerprint in document.get('statevectors', {}).items():
+        _, num_qubits, category = name.split('/')
+        num_qubits = int(num_qubits)
+        if (category in ADVANCED_CATEGORIES and 2 <= num_qubits <= MAX_ADVANCED_QUBITS
+                and fingerprint == advanced_circuit_fingerprint(num_qubits, category)):
+            _advanced_statevectors[(num_qubits, category)] = Statevector(arrays[name])
+            restored += 1
+        else:
+            stale += 1
+    
+    lexicon_version = getattr(get_active_lexicon(), 'version', 'fallback')
+    for key, tokens, quantum_words, total_words in document.get('plans', []):
+        if document.get('lexicon_version') != lexicon_version:
+            stale += 1
+            continue
+        plan_tokens = []
+        for word, engine, category in tokens:
+            statevector = None
+            if engine == 'advanced' and len(word) >= 2:
+                statevector = _advanced_statevectors.get((min(len(word), MAX_ADVANCED_QUBITS), category))
+                if statevector is None:
+                    break
+            plan_tokens.append((word, engine, category, statevector))
+        if len(plan_tokens) == len(tokens):
+            plan_cache.put(key, TransformationPlan(plan_tokens, quantum_words, total_words))
+            restored += 1
+        else:
+            stale += 1
+    
+    if _advanced_statevectors:
+        aer_simulation_ms = document.get('aer_simulation_ms', aer_simulation_ms)
+    return {'restored': restored, 'stale': stale}
+
+snapshot_store = SnapshotStore(SNAPSHOT_PATH, collect_snapshot, restore_snapshot, SNAPSHOT_INTERVAL_SECONDS)
+
+def start_snapshots():
+    """
+    Restore the caches from the snapshot file and keep it saved.
+    Called once by the server entry points (app.py, deploy_https.py, wsgi.py,
+    run_websocket.py), never at import, so tests and tools importing app leave
+    the file alone.
+    
+    Returns:
+        bool: False if snapshots are disabled (QUANTUM_SNAPSHOT_PATH unset)
+    """
+    if not SNAPSHOT_PATH:
+        return False
+    snapshot_store.load()
+    snapshot_store.start()
+    return True
+
+rate_limiter = RateLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+admission = AdmissionController(MAX_IN_FLIGHT, MAX_QUEUE, QUEUE_TIMEOUT_SECONDS)
+request_limit_stats = {'rejected_too_large': 0}
+
+def get_noise_settings(data):
+    """
+    (channel, intensity) from a request's memory_type or channel and intensity fields.
+    
+    Raises:
+        ValueError: If the channel, memory type or intensity is invalid
+    """
+    memory_type = data.get('memory_type')
+    channel = data.get('channel')
+    if channel is None and memory_type is not None:
+        channel = MEMORY_TYPE_CHANNELS.get(str(memory_type).lower())
+        if channel is None:
+            raise ValueError(f"Invalid memory_type: {memory_type}. Use: {', '.join(MEMORY_TYPE_CHANNELS)}")
+    channel = channel or DEFAULT_NOISE_CHANNEL
+    if channel not in NOISE_CHANNELS:
+        raise ValueError(f"Invalid channel: {channel}. Use: {', '.join(NOISE_CHANNELS)}")
+    
+    intensity = data.get('intensity', data.get('memory_intensity', DEFAULT_NOISE_INTENSITY))
+    if not isinstance(intensity, (int, float)) or isinstance(intensity, bool) or not 0 <= intensity <= 1:
+        raise ValueError('intensity must be a number between 0.0 and 1.0')
+    return channel, float(intensity)
+
+def client_id_from(headers, remote_addr):
+    """Identify a client for rate limiting (first X-Forwarded-For hop behind a trusted proxy)."""
+    if TRUST_PROXY:
+        forwarded = headers.get('X-Forwarded-For', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return remote_addr or 'unknown'
+
+def get_client_id():
+    """Identify the client of the current HTTP request."""
+    return client_id_from(request.headers, request.remote_addr)
+
+def admit_client(client_id):
+    """
+    Apply the client's rate limit and claim a simulation slot.
+    
+    Returns:
+        None if admitted (the caller must call admission.release()),
+        otherwise an (error dict with retry_after, status) tuple
+    """
+    wait = rate_limiter.check(client_id)
+    if wait > 0:
+        return {'error': 'Rate limit exceeded', 'retry_after': max(1, math.ceil(wait))}, 429
+    if not admission.acquire():
+        return {'error': 'Server busy, quantum simulation queue is full', 'retry_after': admission.retry_after()}, 503
+    return None
+
+def admission_controlled(endpoint):
+    """Apply per-client rate limiting and the global in-flight cap to a simulation endpoint."""
+    @wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        g.request_started = time.perf_counter()
+        max_body = app.config['MAX_CONTENT_LENGTH']
+        if request.content_length is not None and request.content_length > max_body:
+            request_limit_stats['rejected_too_large'] += 1
+            return jsonify({'error': f'Request body too large (max {max_body} bytes)'}), 413
         
-        gate_type = gate_type.lower()
-        rotation_angle = data.get('rotation_angle', math.pi/4)  # Default rotation
+        rejection = admit_client(get_client_id())
+        if rejection is not None:
+            error, status = rejection
+            response = jsonify(error)
+            response.headers['Retry-After'] = str(error['retry_after'])
+            return response, status
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            admission.release()
+    return wrapper
+
+def get_latency_budget(budget_ms, started=None):
+    """
+    Latency budget for a request from the requested value (X-Latency-Budget-Ms
+    header or latency_budget_ms field) or the server default, counted from when
+    the request arrived (so time spent in the admission queue is included).
+    """
+    try:
+        budget_ms = float(budget_ms) if budget_ms is not None else DEFAULT_LATENCY_BUDGET_MS
+    except (TypeError, ValueError):
+        budget_ms = DEFAULT_LATENCY_BUDGET_MS
+    budget_ms = min(max(budget_ms, 0.0), MAX_LATENCY_BUDGET_MS)
+    return LatencyBudget(budget_ms, started)
+
+def check_text_limits(text):
+    """Return an error message if text exceeds the configured size limits, else None."""
+    if len(text) > MAX_TEXT_CHARS:
+        return f'Text too long: {len(text)} characters (max {MAX_TEXT_CHARS})'
+    word_count = len(re.findall(r'\b\w+\b', text))
+    if word_count > MAX_TEXT_WORDS:
+        return f'Text too long: {word_count} words (max {MAX_TEXT_WORDS})'
+    return None
+
+def qubit_superposition_strength(statevector, qubit):
+    """Superposition strength 2*sqrt(p0*p1) of one qubit of a register (2|αβ| for a pure qubit)."""
+    p0, p1 = statevector.probabilities([qubit])
+    return float(2 * math.sqrt(max(p0 * p1, 0.0)))
+
+def get_session_qubit_state(session_id):
+    """
+    Single-qubit state conditioned on qubit 0 of a session register.
+    Text transforms start their qubits here instead of |0>.
+    """
+    register = Statevector(session_store.get(session_id))
+    p0, p1 = register.probabilities([0])
+    return [math.sqrt(p0), math.sqrt(p1)]
+
+def apply_session_gate(session_id, gate_type, rotation_angle, target=0):
+    """
+    Apply a gate to one qubit of a session register, then measure that qubit.
+    The collapsed register is stored back, so later requests see the outcome.
+    
+    Returns:
+        tuple: (measurement, superposition strength before measurement, register probabilities)
+    """
+    qc = QuantumCircuit(session_store.num_qubits)
+    if gate_type == 'bit_flip':
+        qc.x(target)
+    elif gate_type == 'phase_flip':
+        qc.z(target)
+    elif gate_type == 'rotation':
+        qc.ry(rotation_angle, target)
+    
+    def measure_after_gate(amplitudes):
+        register = Statevector(amplitudes).evolve(qc)
+        superposition = qubit_superposition_strength(register, target)
+        outcome, register = register.measure([target])
+        return register.data, (int(outcome), superposition, register.probabilities())
+    
+    return session_store.update(session_id, measure_after_gate)
+
+def parse_gate_sequence(gates, num_qubits):
+    """
+    Validate a /quantum_gate sequence.
+    
+    Args:
+        gates (list): [{"gate": "hadamard", "target": 0}, {"gate": "cnot", "control": 0, "target": 1}, ...]
+        num_qubits (int): Register size
+    
+    Returns:
+        list: (name, QuantumGate, target, control) tuples
+    
+    Raises:
+        ValueError: If the sequence is malformed
+    """
+    if not isinstance(gates, list) or not gates:
+        raise ValueError('gates must be a non-empty list')
+    if len(gates) > MAX_SEQUENCE_GATES:
+        raise ValueError(f'Too many gates: {len(gates)} (max {MAX_SEQUENCE_GATES})')
+    
+    def qubit_index(step, value, field):
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value < num_qubits:
+            raise ValueError(f'Step {step}: {field} must be a qubit index below {num_qubits}')
+        return value
+    
+    parsed = []
+    for step, spec in enumerate(gates):
+        if not isinstance(spec, dict):
+            raise ValueError(f'Step {step}: expected an object')
+        name = str(spec.get('gate') or spec.get('gate_type') or '').lower()
+        gate_type = GATE_NAMES.get(name)
+        if gate_type is None:
+            raise ValueError(f"Step {step}: invalid gate '{name}'. Use: {', '.join(sorted(GATE_NAMES))}")
         
-        print(f"[Flask] 🔧 Normalized gate_type: '{gate_type}'")
-        print(f"[Flask] 🔄 Rotation angle: {rotation_angle}")
+        target = qubit_index(step, spec.get('target', 0), 'target')
+        control = None
+        if gate_type in TWO_QUBIT_GATES:
+            control = qubit_index(step, spec.get('control'), 'control')
+            if control == target:
+                raise ValueError(f'Step {step}: control and target must differ')
         
-        # Create qubit and apply gate
-        print("[Flask] 🎲 Creating new qubit...")
-        qubit = Qubit()
+        angle = spec.get('angle', spec.get('rotation_angle', math.pi/4))
+        if not isinstance(angle, (int, float)) or isinstance(angle, bool) or not math.isfinite(angle):
+            raise ValueError(f'Step {step}: angle must be a finite number')
+        parsed.append((name, QuantumGate(gate_type, float(angle)), target, control))
+    return parsed
+
+def simulate_gate_sequence(parsed_gates, num_qubits, shots, initial_state=None, seed=None):
+    """
+    Run a whole gate sequence in one pass over a register.
+    
+    Returns:
+        tuple: (final Statevector, per-step results, measurement counts over `shots` samples)
+    """
+    state = Statevector(initial_state) if initial_state is not None else Statevector.from_label('0' * num_qubits)
+    steps = []
+    for name, gate, target, control in parsed_gates:
+        qc = QuantumCircuit(num_qubits)
+        gate.apply_to(qc, target, control)
+        state = state.evolve(qc)
+        steps.append({
+            'gate': name,
+            'target': target,
+            'control': control,
+            'superposition_strength': [round(qubit_superposition_strength(state, q), 3) for q in range(num_qubits)]
+        })
+    
+    if seed is not None:
+        state.seed(seed)
+    counts = state.sample_counts(shots)
+    return state, steps, {outcome: int(count) for outcome, count in sorted(counts.items())}
+
+def evolve_session_after_text(session_id, plan):
+    """Reading quantum-heavy text rotates the player's memory qubit a little further."""
+    qc = QuantumCircuit(session_store.num_qubits)
+    qc.ry(SESSION_TEXT_ROTATION * plan.coverage_percent / 100, 0)
+    
+    def rotate(amplitudes):
+        register = Statevector(amplitudes).evolve(qc)
+        return register.data, register
+    
+    return session_store.update(session_id, rotate)
+
+def transformation_plan_key(text, lexicon):
+    """Cache key of a text's plan; keying on the lexicon version retires stale plans on reload."""
+    lexicon_version = getattr(lexicon, 'version', 'fallback')
+    return f"{lexicon_version}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+def get_transformation_plan(text, budget=None):
+    """Return (plan, cached) for text, building and caching the plan on a miss."""
+    # One lexicon snapshot per request
+    lexicon = get_active_lexicon()
+    key = transformation_plan_key(text, lexicon)
+    plan = plan_cache.get(key)
+    if plan is not None:
+        return plan, True
+    
+    plan = build_transformation_plan(text, lexicon, budget)
+    plan_cache.put(key, plan)
+    return plan, False
+
+def run_quantum_gate(data):
+    """
+    Transport-independent body of /quantum_gate, shared by HTTP and WebSocket clients.
+    
+    Returns:
+        tuple: (response dict, HTTP-style status code)
+    """
+    if not isinstance(data, dict) or not data:
+        print("[Flask] ❌ ERROR: No JSON data received")
+        return {'error': 'No JSON data provided'}, 400
+    
+    if 'gates' in data:
+        return quantum_gate_sequence(data)
         
-        # Apply the requested gate
-        print(f"[Flask] ⚛️ Applying {gate_type} gate...")
-        if gate_type == 'bit_flip':
-            qubit.bit_flip()
-            print("[Flask] ✅ Bit-flip gate applied")
-        elif gate_type == 'phase_flip':
-            qubit.phase_flip()
-            print("[Flask] ✅ Phase-flip gate applied")
-        elif gate_type == 'rotation':
-            qubit.rotate_y(rotation_angle)
-            print(f"[Flask] ✅ Rotation gate applied with angle {rotation_angle}")
-        else:
-            print(f"[Flask] ❌ ERROR: Invalid gate_type: '{gate_type}'")
-            return jsonify({'error': f'Invalid gate_type: {gate_type}. Use: bit_flip, phase_flip, or rotation'}), 400
+    # Handle both 'gate' and 'gate_type' for compatibility
+    gate_type = data.get('gate_type') or data.get('gate')
+    
+    if not gate_type:
+        print("[Flask] ❌ ERROR: Missing gate_type/gate parameter")
+        return {'error': 'Missing gate_type or gate parameter'}, 400
         
-        # Calculate superposition strength BEFORE measurement
-        print("[Flask] 📊 Calculating superposition strength...")
-        superposition = qubit.get_superposition_strength()
+    print(f"[Flask] 📡 Gate type received: '{gate_type}'")
+    
+    gate_type = gate_type.lower()
+    rotation_angle = data.get('rotation_angle', math.pi/4)  # Default rotation
+    if not isinstance(rotation_angle, (int, float)) or isinstance(rotation_angle, bool) or not math.isfinite(rotation_angle):
+        return {'error': 'rotation_angle must be a finite number'}, 400
+    
+    print(f"[Flask] 🔧 Normalized gate_type: '{gate_type}'")
+    print(f"[Flask] 🔄 Rotation angle: {rotation_angle}")
+    
+    session_id = data.get('session_id')
+    if session_id is not None:
+        try:
+            session_id = validate_session_id(session_id)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         
-        # Now measure the result
-        print("[Flask] 📊 Measuring qubit...")
-        measurement = qubit.measure()
+        target = data.get('target', 0)
+        if gate_type not in ['bit_flip', 'phase_flip', 'rotation']:
+            print(f"[Flask] ❌ ERROR: Invalid gate_type: '{gate_type}'")
+            return {'error': f'Invalid gate_type: {gate_type}. Use: bit_flip, phase_flip, or rotation'}, 400
+        if not isinstance(target, int) or isinstance(target, bool) or not 0 <= target < session_store.num_qubits:
+            return {'error': f'target must be a qubit index below {session_store.num_qubits}'}, 400
         
-        success = measurement == 0  # Success if measurement collapses to |0>
+        print(f"[Flask] 🧠 Applying {gate_type} to qubit {target} of session '{session_id}'")
+        measurement, superposition, probabilities = apply_session_gate(session_id, gate_type, rotation_angle, target)
+        success = measurement == 0
         
         result = {
             'gate_type': gate_type,
             'measurement': measurement,
             'superposition_strength': round(superposition, 3),
-            'success': success
+            'success': success,
+            'session_id': session_id,
+            'register_probabilities': [round(float(p), 3) for p in probabilities]
         }
-        
-        print(f"[Flask] 🎯 Measurement result: {measurement}")
-        print(f"[Flask] 🌊 Superposition strength: {round(superposition, 3)}")
-        print(f"[Flask] ✅ Gate operation {'SUCCESS' if success else 'FAILURE'}")
         print(f"[Flask] 📤 Sending response: {result}")
+        return result, 200
+    
+    # Create qubit and apply gate
+    print("[Flask] 🎲 Creating new qubit...")
+    qubit = Qubit()
+    
+    # Apply the requested gate
+    print(f"[Flask] ⚛️ Applying {gate_type} gate...")
+    if gate_type == 'bit_flip':
+        qubit.bit_flip()
+        print("[Flask] ✅ Bit-flip gate applied")
+    elif gate_type == 'phase_flip':
+        qubit.phase_flip()
+        print("[Flask] ✅ Phase-flip gate applied")
+    elif gate_type == 'rotation':
+        qubit.rotate_y(rotation_angle)
+        print(f"[Flask] ✅ Rotation gate applied with angle {rotation_angle}")
+    else:
+        print(f"[Flask] ❌ ERROR: Invalid gate_type: '{gate_type}'")
+        return {'error': f'Invalid gate_type: {gate_type}. Use: bit_flip, phase_flip, or rotation'}, 400
+    
+    # Calculate superposition strength BEFORE measurement
+    print("[Flask] 📊 Calculating superposition strength...")
+    superposition = qubit.get_superposition_strength()
+    
+    # Now measure the result
+    print("[Flask] 📊 Measuring qubit...")
+    measurement = qubit.measure()
+    
+    success = measurement == 0  # Success if measurement collapses to |0>
+    
+    result = {
+        'gate_type': gate_type,
+        'measurement': measurement,
+        'superposition_strength': round(superposition, 3),
+        'success': success
+    }
+    
+    print(f"[Flask] 🎯 Measurement result: {measurement}")
+    print(f"[Flask] 🌊 Superposition strength: {round(superposition, 3)}")
+    print(f"[Flask] ✅ Gate operation {'SUCCESS' if success else 'FAILURE'}")
+    print(f"[Flask] 📤 Sending response: {result}")
+    print("=" * 50)
+    
+    return result, 200
+
+@app.route('/quantum_gate', methods=['POST'])
+@admission_controlled
+def quantum_gate_endpoint():
+    """
+    Minimal endpoint for quantum gate operations compatible with Godot game logic.
+    Handles bit_flip, phase_flip, and rotation gates, or an ordered 'gates' list
+    (see quantum_gate_sequence) for a whole puzzle move in one request.
+    """
+    try:
         print("=" * 50)
+        print("[Flask] QUANTUM GATE REQUEST RECEIVED")
+        print("=" * 50)
+        
+        data = request.get_json(silent=True)
+        print(f"[Flask] Raw request data: {data}")
         
-        return jsonify(result)
+        result, status = run_quantum_gate(data)
+        return jsonify(result), status
         
     except Exception as e:
         print(f"[Flask] ❌ CRITICAL ERROR in quantum_gate_endpoint: {str(e)}")
@@ -372,7 +1059,146 @@ def quantum_gate_endpoint():
             'debug_info': f'Exception type: {type(e).__name__}'
         }), 500
 
+def quantum_gate_sequence(data):
+    """
+    Multi-gate form of /quantum_gate: simulate an ordered gate list over a small
+    register once and sample the final state `shots` times.
+    
+    Returns:
+        tuple: (response dict, HTTP-style status code)
+    """
+    session_id = data.get('session_id')
+    try:
+        if session_id is not None:
+            session_id = validate_session_id(session_id)
+            num_qubits = session_store.num_qubits
+        else:
+            num_qubits = data.get('num_qubits', 1)
+            if not isinstance(num_qubits, int) or isinstance(num_qubits, bool) or not 1 <= num_qubits <= MAX_SEQUENCE_QUBITS:
+                raise ValueError(f'num_qubits must be between 1 and {MAX_SEQUENCE_QUBITS}')
+        
+        shots = data.get('shots', 1)
+        if not isinstance(shots, int) or isinstance(shots, bool) or not 1 <= shots <= MAX_SHOTS:
+            raise ValueError(f'shots must be between 1 and {MAX_SHOTS}')
+        seed = data.get('seed')
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            raise ValueError('seed must be an integer')
+        
+        parsed_gates = parse_gate_sequence(data['gates'], num_qubits)
+    except ValueError as e:
+        print(f"[Flask] ❌ ERROR: {e}")
+        return {'error': str(e)}, 400
+    
+    print(f"[Flask] ⚛️ Simulating {len(parsed_gates)} gates on {num_qubits} qubits, {shots} shots")
+    if session_id is not None:
+        # Sampling does not collapse the register: each shot is a fresh preparation
+        def run_on_register(amplitudes):
+            result = simulate_gate_sequence(parsed_gates, num_qubits, shots, amplitudes, seed)
+            return result[0].data, result
+        
+        state, steps, counts = session_store.update(session_id, run_on_register)
+    else:
+        state, steps, counts = simulate_gate_sequence(parsed_gates, num_qubits, shots, None, seed)
+    
+    zero_outcome = '0' * num_qubits
+    result = {
+        'num_qubits': num_qubits,
+        'shots': shots,
+        'steps': steps,
+        'counts': counts,
+        'final_superposition_strength': steps[-1]['superposition_strength'],
+        'most_likely': max(counts, key=counts.get),
+        'success_rate': round(counts.get(zero_outcome, 0) / shots, 3)
+    }
+    if session_id is not None:
+        result['session_id'] = session_id
+        result['register_probabilities'] = [round(float(p), 3) for p in state.probabilities()]
+    
+    print(f"[Flask] 📤 Sending response: {result}")
+    return result, 200
+
+def run_quantum_text(data, budget):
+    """
+    Transport-independent body of /quantum_text, shared by HTTP and WebSocket clients.
+    
+    Returns:
+        tuple: (response dict, HTTP-style status code)
+    """
+    if not isinstance(data, dict) or 'text' not in data:
+        print("ERROR: Missing text parameter")
+        return {'error': 'Missing text parameter'}, 400
+    
+    text = data['text']
+    if not isinstance(text, str):
+        return {'error': 'text must be a string'}, 400
+    
+    limit_error = check_text_limits(text)
+    if limit_error:
+        request_limit_stats['rejected_too_large'] += 1
+        print(f"ERROR: {limit_error}")
+        return {'error': limit_error}, 413
+    
+    print(f"Processing text: {text}")
+    
+    session_id = data.get('session_id')
+    initial_state = None
+    if session_id is not None:
+        try:
+            session_id = validate_session_id(session_id)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        initial_state = get_session_qubit_state(session_id)
+    
+    memory_noise = None
+    if 'memory_intensity' in data:
+        try:
+            memory_noise = get_noise_settings({'memory_intensity': data['memory_intensity'],
+                                               'memory_type': data.get('memory_type'),
+                                               'channel': data.get('memory_channel')})
+        except ValueError as e:
+            return {'error': str(e)}, 400
+    
+    # Tokenization and categorization are deterministic and cached per text;
+    # only the rendering below draws fresh quantum randomness
+    plan, plan_cached = get_transformation_plan(text, budget)
+    print(f"Transformation plan {'cache hit' if plan_cached else 'built'}: "
+          f"{plan.quantum_words}/{plan.total_words} quantum words")
+    
+    # A prefetched render is only served if it started from the same qubit state
+    prefetched = None
+    if memory_noise is None:
+        prefetched = prefetcher.take(prefetch_key(text, initial_state))
+    
+    if prefetched is not None:
+        transformed, degraded_words = prefetched, 0
+        print("Served prefetched transformation")
+    else:
+        transformed, degraded_words = render_transformation_plan(plan, initial_state, budget, memory_noise)
+    if degraded_words:
+        print(f"Latency budget {budget.budget_ms:.0f} ms: degraded {degraded_words} words")
+    
+    response = {
+        'original': text,
+        'transformed': transformed,
+        'coverage_percent': round(plan.coverage_percent, 1),
+        'quantum_words': plan.quantum_words,
+        'total_words': plan.total_words,
+        'plan_cached': plan_cached,
+        'prefetched': prefetched is not None,
+        'degraded_words': degraded_words,
+        'latency_budget_ms': budget.budget_ms,
+        'elapsed_ms': round(budget.elapsed_ms(), 1)
+    }
+    
+    if session_id is not None:
+        register = evolve_session_after_text(session_id, plan)
+        response['session_id'] = session_id
+        response['register_probabilities'] = [round(float(p), 3) for p in register.probabilities()]
+    
+    return response, 200
+
 @app.route('/quantum_text', methods=['POST'])
+@admission_controlled
 def quantum_text_endpoint():
     """
     Single comprehensive endpoint for quantum text processing.
@@ -381,55 +1207,15 @@ def quantum_text_endpoint():
     """
     try:
         print("=== QUANTUM TEXT REQUEST ===")
-        data = request.get_json()
+        data = request.get_json(silent=True)
         print(f"Received data: {data}")
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
         
-        if not data or 'text' not in data:
-            print("ERROR: Missing text parameter")
-            return jsonify({'error': 'Missing text parameter'}), 400
-        
-        text = data['text']
-        print(f"Processing text: {text}")
-        
-        # Process each word with quantum transformations
-        import re
-        words = re.findall(r'\b\w+\b|\W+', text)
-        
-        transformed_words = []
-        stats = {'quantum_words': 0, 'total_words': 0}
-        
-        for word in words:
-            if not word.strip().isalpha():
-                transformed_words.append(word)
-                continue
-                
-            stats['total_words'] += 1
-            print(f"Processing word: '{word}'")
-            
-            category = get_quantum_category_for_word(word)
-            print(f"Word '{word}' categorized as: {category}")
-            
-            if category != 'original':
-                stats['quantum_words'] += 1
-                print(f"Applying quantum transformation to '{word}' with category '{category}'")
-                transformed_word = apply_quantum_transformation(word, category)
-                print(f"Transformed '{word}' -> '{transformed_word}'")
-            else:
-                transformed_word = word
-                print(f"Word '{word}' kept original")
-                
-            transformed_words.append(transformed_word)
-        
-        # Calculate coverage
-        coverage = (stats['quantum_words'] / stats['total_words'] * 100) if stats['total_words'] > 0 else 0
-        
-        return jsonify({
-            'original': text,
-            'transformed': ''.join(transformed_words),
-            'coverage_percent': round(coverage, 1),
-            'quantum_words': stats['quantum_words'],
-            'total_words': stats['total_words']
-        })
+        budget = get_latency_budget(request.headers.get('X-Latency-Budget-Ms') or data.get('latency_budget_ms'),
+                                    g.get('request_started'))
+        result, status = run_quantum_text(data, budget)
+        return jsonify(result), status
         
     except Exception as e:
         print(f"ERROR in quantum_text_endpoint: {str(e)}")
@@ -438,6 +1224,245 @@ def quantum_text_endpoint():
         print(f"Traceback: {traceback.format_exc()}")
         return jsonify({'error': str(e), 'debug_info': f'Exception type: {type(e).__name__}'}), 500
 
+def run_quantum_memory(data):
+    """
+    Transport-independent body of /quantum_memory.
+    
+    Returns:
+        tuple: (response dict, HTTP-style status code)
+    """
+    if not data or not isinstance(data.get('text'), str):
+        return {'error': 'Missing text parameter'}, 400
+    
+    text = data['text']
+    limit_error = check_text_limits(text)
+    if limit_error:
+        request_limit_stats['rejected_too_large'] += 1
+        return {'error': limit_error}, 413
+    try:
+        channel, intensity = get_noise_settings(data)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    memory_echo, coherence = apply_noise_transformation(text, channel, intensity)
+    if coherence > 0.7:
+        memory_state = 'coherent'
+    elif coherence > 0.3:
+        memory_state = 'fragmenting'
+    else:
+        memory_state = 'decohered'
+    
+    return {
+        'original': text,
+        'memory_echo': memory_echo,
+        'memory_type': data.get('memory_type'),
+        'channel': channel,
+        'intensity': intensity,
+        'memory_state': memory_state,
+        'quantum_coherence': round(coherence, 3)
+    }, 200
+
+def prefetch_key(text, initial_state=None):
+    """Prefetch result key; renders conditioned on a session's qubit state also carry that state."""
+    key = transformation_plan_key(text, get_active_lexicon())
+    if initial_state is None:
+        return key
+    return key + '@' + ','.join(f'{float(amplitude):.9f}' for amplitude in initial_state)
+
+def prefetch_text(text, initial_state=None):
+    """
+    Background prefetch: build and cache the full-quality plan, then pre-render one
+    response, starting from the qubit state of the session at prefetch time.
+    """
+    plan, _ = get_transformation_plan(text)
+    transformed, _ = render_transformation_plan(plan, list(initial_state) if initial_state is not None else None)
+    return transformed
+
+prefetcher = Prefetcher(
+    prefetch_text,
+    prefetch_key,
+    admission.try_acquire,
+    admission.release,
+    max_queue=PREFETCH_MAX_QUEUE,
+    max_results=PREFETCH_MAX_RESULTS
+)
+prefetcher.start()
+
+def collect_prefetch_texts(data):
+    """
+    Texts to prefetch with their priority (lower runs first).
+    
+    Accepts either an ordered 'texts' list, or a dialogue graph: 'steps' (each
+    {"id", "text", "options": [{"text", "next"}], "next"}), the 'current' step id
+    and a 'depth'. Graph texts are prioritized by their distance from the current step.
+    
+    Raises:
+        ValueError: If the payload is malformed
+    """
+    if 'texts' in data:
+        texts = data['texts']
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ValueError('texts must be a list of strings')
+        candidates = list(enumerate(texts))
+    else:
+        steps = data.get('steps')
+        if not isinstance(steps, list) or not all(isinstance(step, dict) and 'id' in step for step in steps):
+            raise ValueError("Provide 'texts' or 'steps' (a list of objects with an 'id')")
+        graph = {str(step['id']): step for step in steps}
+        current = str(data.get('current', steps[0]['id'] if steps else ''))
+        if current not in graph:
+            raise ValueError(f"current step '{current}' is not in steps")
+        depth = data.get('depth', PREFETCH_DEFAULT_DEPTH)
+        if not isinstance(depth, int) or depth < 0:
+            raise ValueError('depth must be a non-negative integer')
+        
+        # Breadth-first from the current step: nearer branches are prefetched first
+        candidates = []
+        distances = {current: 0}
+        frontier = [current]
+        while frontier:
+            step_id = frontier.pop(0)
+            step = graph[step_id]
+            distance = distances[step_id]
+            if isinstance(step.get('text'), str):
+                candidates.append((distance, step['text']))
+            
+            children = [step.get('next')]
+            for option in step.get('options') or []:
+                if isinstance(option, dict):
+                    if isinstance(option.get('text'), str):
+                        candidates.append((distance, option['text']))
+                    children.append(option.get('next'))
+            
+            for child in children:
+                child = str(child) if child is not None else None
+                if child in graph and child not in distances and distance < depth:
+                    distances[child] = distance + 1
+                    frontier.append(child)
+    
+    seen = set()
+    result = []
+    for priority, text in candidates:
+        if text.strip() and text not in seen and check_text_limits(text) is None:
+            seen.add(text)
+            result.append((priority, text))
+    return result[:PREFETCH_MAX_TEXTS]
+
+def get_prefetch_group(data, client_id):
+    """Prefetch group: the session if given, else an explicit group, else the client."""
+    group = data.get('session_id') or data.get('group')
+    return str(group) if group else client_id
+
+def run_prefetch(data, client_id):
+    """
+    Transport-independent body of /prefetch.
+    
+    Returns:
+        tuple: (response dict, HTTP-style status code)
+    """
+    try:
+        texts = collect_prefetch_texts(data)
+        session_id = data.get('session_id')
+        if session_id is not None:
+            session_id = validate_session_id(session_id)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    # Session renders start from the player's current qubit state; they are hits
+    # as long as that state is unchanged when the text is requested
+    initial_state = tuple(get_session_qubit_state(session_id)) if session_id is not None else None
+    group = get_prefetch_group(data, client_id)
+    queued = prefetcher.submit(group, texts, initial_state)
+    print(f"[Prefetch] 🔮 Queued {queued}/{len(texts)} texts for group '{group}'")
+    return {'group': group, 'queued': queued, 'texts': len(texts)}, 200
+
+def run_admitted(client_id, handler, *args):
+    """Run handler(*args) -> (result, status) under the same admission control as HTTP requests."""
+    rejection = admit_client(client_id)
+    if rejection is not None:
+        return rejection
+    try:
+        return handler(*args)
+    finally:
+        admission.release()
+
+def ws_transform(message, client_id):
+    """WebSocket 'transform' message: same fields as the /quantum_text body."""
+    budget = get_latency_budget(message.get('latency_budget_ms'))
+    return run_admitted(client_id, run_quantum_text, message, budget)
+
+def ws_gate(message, client_id):
+    """WebSocket 'gate' message: same fields as the /quantum_gate body."""
+    return run_admitted(client_id, run_quantum_gate, message)
+
+def ws_memory(message, client_id):
+    """WebSocket 'memory' message: same fields as the /quantum_memory body."""
+    return run_admitted(client_id, run_quantum_memory, message)
+
+def ws_prefetch(message, client_id):
+    """WebSocket 'prefetch' message: same fields as the /prefetch body."""
+    return run_admitted(client_id, run_prefetch, message, client_id)
+
+websocket_channel = None
+if WebSocketChannel is not None:
+    # Enough workers for every in-flight and queued slot, so admission control decides who waits
+    websocket_channel = WebSocketChannel(
+        {'transform': ws_transform, 'gate': ws_gate, 'memory': ws_memory, 'prefetch': ws_prefetch},
+        max_workers=MAX_IN_FLIGHT + MAX_QUEUE,
+        max_message_bytes=app.config['MAX_CONTENT_LENGTH'],
+        identify=client_id_from
+    )
+
+def start_websocket_channel(ssl_context=None):
+    """
+    Start the WebSocket channel next to the Flask server.
+    Under gunicorn, run_websocket.py calls this in its own process.
+    
+    Returns:
+        threading.Thread: The channel thread, or None if disabled or unavailable
+    """
+    if websocket_channel is None:
+        print("[WebSocket] ⚠️ Not started: the websockets package is not installed")
+        return None
+    if WS_PORT == 0:
+        print("[WebSocket] ⚠️ Not started: disabled with QUANTUM_WS_PORT=0")
+        return None
+    return websocket_channel.start(WS_HOST, WS_PORT, ssl_context)
+
+@app.route('/quantum_memory', methods=['POST'])
+@admission_controlled
+def quantum_memory_endpoint():
+    """
+    Quantum memory decoherence for storytelling. memory_type (fragmented, entangled,
+    superposition) or channel picks the noise channel; intensity (0.0-1.0) its strength.
+    """
+    data = request.get_json(silent=True)
+    result, status = run_quantum_memory(data if isinstance(data, dict) else None)
+    return jsonify(result), status
+
+@app.route('/prefetch', methods=['POST'])
+@admission_controlled
+def prefetch_endpoint():
+    """
+    Queue upcoming dialogue texts for background transformation. Replaces the
+    group's earlier prefetches, so branches the player moved away from are dropped.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'No JSON data provided'}), 400
+    result, status = run_prefetch(data, get_client_id())
+    return jsonify(result), status
+
+@app.route('/prefetch/cancel', methods=['POST'])
+def prefetch_cancel_endpoint():
+    """Drop a group's queued prefetches (without a body, those of the client)."""
+    data = request.get_json(silent=True) if request.get_data() else {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    group = get_prefetch_group(data, get_client_id())
+    prefetcher.cancel(group)
+    return jsonify({'group': group, 'cancelled': True})
+
 @app.route('/quantum_echo_types', methods=['GET'])
 def get_echo_types():
     """Get available quantum transformation types."""
@@ -451,7 +1476,8 @@ def get_echo_types():
         'advanced_transformations': [
             {'name': 'quantum_gates', 'description': 'Apply quantum gate sequences (H, X, Y, Z, ROT)'},
             {'name': 'quantum_entanglement', 'description': 'Multi-qubit entanglement transformations'},
-            {'name': 'quantum_memory', 'description': 'Quantum memory effects for story integration'}
+            {'name': 'quantum_memory', 'description': 'Quantum memory effects for story integration'},
+            {'name': 'quantum_decoherence', 'description': 'Depolarizing, amplitude damping and dephasing noise channels'}
         ]
     })
 
@@ -481,7 +1507,27 @@ def health_check():
         'service': 'quantum-echo-server',
         'qiskit_available': qiskit_status,
         'qiskit_status': qiskit_version,
-        'quantum_classes': ['Qubit', 'QuantumGate', 'QuantumCircuitManager']
+        'quantum_classes': ['Qubit', 'QuantumGate', 'QuantumCircuitManager'],
+        'plan_cache': plan_cache.stats(),
+        'lexicon': get_lexicon_info()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Cache, lexicon, session, admission, WebSocket, prefetch, noise channel and snapshot metrics."""
+    return jsonify({
+        'plan_cache': plan_cache.stats(),
+        'lexicon': get_lexicon_info(),
+        'sessions': session_store.stats(),
+        'admission': {
+            **admission.stats(),
+            **rate_limiter.stats(),
+            **request_limit_stats
+        },
+        'websocket': websocket_channel.stats() if websocket_channel is not None else {'running': False},
+        'prefetch': prefetcher.stats(),
+        'noise_channels': get_noise_stats(),
+        'snapshot': snapshot_store.stats()
     })
 
 @app.route('/', methods=['GET'])
@@ -493,8 +1539,14 @@ def index():
         'description': 'Advanced quantum text transformation using real qiskit quantum gates and circuits',
         'endpoints': {
             'POST /quantum_text': 'Comprehensive quantum text processing with word dictionary',
+            'POST /quantum_gate': 'Single gate or multi-gate sequence with measurement (optional session_id register)',
             'GET /quantum_echo_types': 'Get available transformation types',
-            'GET /health': 'Health check with qiskit functionality test'
+            'GET /health': 'Health check with qiskit functionality test',
+            'POST /quantum_memory': 'Decoherence memory effects from cached noise channels',
+            'POST /prefetch': 'Transform upcoming dialogue steps and options in the background',
+            'POST /prefetch/cancel': 'Drop queued prefetches for a session or group',
+            'GET /metrics': 'Plan cache, lexicon, session, admission, WebSocket, prefetch, noise and snapshot metrics',
+            f'WS :{WS_PORT}': 'Persistent channel for transform and gate messages'
         },
         'quantum_features': [
             'Real qiskit quantum circuits with Statevector simulation',
@@ -508,4 +1560,9 @@ if __name__ == '__main__':
     # app.run(host='0.0.0.0', port=8000, ssl_context='adhoc', debug=True)
     
     # For HTTP (current setup)
+    # The debug reloader runs this block twice; only the serving child opens the WebSocket port
+    # and owns the snapshot (the watching parent has empty caches)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_snapshots()
+        start_websocket_channel()
     app.run(host='0.0.0.0', port=8000, debug=True)
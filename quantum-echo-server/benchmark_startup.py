@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time to steady-state latency with and without a warm-start snapshot.
+
+Each run starts a fresh interpreter, imports the server and replays the same
+dialogue workload through the Flask test client:
+- cold: no snapshot file, every statevector and plan is computed from scratch
+- warm: restores the snapshot the cold run saved at the end
+
+Both runs use a snapshot file in a temporary directory, never the server's own.
+
+Time to steady state is measured from the start of the worker script (before the
+server import) until the first request from which a rolling window of requests
+stays under twice the steady-state median latency (the median of the second half
+of the workload).
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --requests 200 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+WINDOW = 5
+STEADY_FACTOR = 2.0
+
+def build_workload(count, seed=11):
+    """Dialogue-like texts from the lexicon, with the repeats a story naturally has."""
+    import quantum_word_dictionary
+
+    lexicon = quantum_word_dictionary.get_active_lexicon()
+    words = sorted(lexicon.word_categories)
+    fillers = ['the', 'and', 'of', 'in', 'we', 'it', 'was', 'to']
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(max(count // 3, 1)):
+        line = [rng.choice(words if rng.random() < 0.6 else fillers) for _ in range(rng.randint(4, 10))]
+        lines.append(' '.join(line).capitalize() + '.')
+    return [rng.choice(lines) for _ in range(count)]
+
+def time_to_steady_state(latencies, offsets):
+    """(steady-state median ms, ms from worker start until latency settles)."""
+    steady = statistics.median(latencies[len(latencies) // 2:])
+    threshold = steady * STEADY_FACTOR
+    for i in range(len(latencies)):
+        if all(latency <= threshold for latency in latencies[i:i + WINDOW]):
+            return steady, offsets[i]
+    return steady, offsets[-1]
+
+def run_worker(snapshot_path, count):
+    """Runs in a fresh process; prints one JSON result line."""
+    process_started = time.perf_counter()
+    os.environ['QUANTUM_SNAPSHOT_PATH'] = snapshot_path
+    os.environ.setdefault('QUANTUM_LEXICON_WATCH', '0')
+    os.environ.setdefault('QUANTUM_RATE_LIMIT_PER_SECOND', '0')
+
+    import app as server
+    server.start_snapshots()
+    import_ms = (time.perf_counter() - process_started) * 1000
+
+    client = server.app.test_client()
+    latencies = []
+    offsets = []
+    for text in build_workload(count):
+        started = time.perf_counter()
+        response = client.post('/quantum_text', json={'text': text, 'latency_budget_ms': 60000})
+        if response.status_code != 200:
+            raise RuntimeError(f'/quantum_text returned {response.status_code}: {response.get_json()}')
+        finished = time.perf_counter()
+        latencies.append((finished - started) * 1000)
+        offsets.append((finished - process_started) * 1000)
+
+    steady_ms, settled_ms = time_to_steady_state(latencies, offsets)
+    snapshot = server.snapshot_store.stats()
+    server.snapshot_store.save()
+    result = {
+        'import_ms': round(import_ms, 1),
+        'snapshot_restored_entries': snapshot['restored_entries'],
+        'snapshot_load_ms': snapshot['last_load_ms'],
+        'first_request_ms': round(latencies[0], 1),
+        'steady_p50_ms': round(steady_ms, 2),
+        'time_to_steady_state_ms': round(settled_ms, 1),
+        'workload_ms': round(sum(latencies), 1)
+    }
+    print('RESULT ' + json.dumps(result))
+
+def run_in_subprocess(snapshot_path, count):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', '--snapshot', snapshot_path, '--requests', str(count)],
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    ).stdout
+    for line in output.splitlines():
+        if line.startswith('RESULT '):
+            return json.loads(line[len('RESULT '):])
+    raise RuntimeError(f'Benchmark worker printed no result:\n{output}')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure time to steady-state latency, cold vs warm start.')
+    parser.add_argument('--requests', type=int, default=120, help='Requests in the replayed workload')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--snapshot', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.snapshot, args.requests)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, 'quantum_cache_snapshot.npz')
+        results = {
+            'cold': run_in_subprocess(snapshot_path, args.requests),
+            'warm': run_in_subprocess(snapshot_path, args.requests)
+        }
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print("🚀 QUANTUM ECHO SERVER STARTUP BENCHMARK")
+    print("=" * 50)
+    print(f"{'':28}{'cold':>10}{'warm':>10}")
+    for field in results['cold']:
+        print(f"{field:28}{results['cold'][field]:>10}{results['warm'][field]:>10}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
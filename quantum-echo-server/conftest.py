@@ -0,0 +1,11 @@
+"""Shared pytest fixtures for the offline server tests."""
+
+import pytest
+
+import app as server
+
+@pytest.fixture
+def client(monkeypatch):
+    # Tests fire many requests from one client; keep the rate limiter out of the way
+    monkeypatch.setattr(server.rate_limiter, 'rate', 0)
+    return server.app.test_client()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Quantum word coverage audit for whole story corpora.
+
+Streams text files in chunks, fans the chunks out to a process pool and merges
+per-category counters, so memory stays flat however large the corpus is. Built
+on the same categorization as analyze_text_coverage in quantum_word_dictionary.
+
+Usage:
+    python coverage_audit.py story_drafts/ localization/*.txt --top 30
+    python coverage_audit.py big_script.txt --workers 8 --json > coverage.json
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import re
+import sys
+
+import quantum_word_dictionary
+
+DEFAULT_CHUNK_CHARS = 1024 * 1024
+# An unbroken run of word characters longer than this is split across chunks
+# instead of being carried forward without bound
+MAX_WORD_CHARS = 4096
+DEFAULT_EXTENSIONS = ('.txt', '.md')
+CATEGORIES = list(quantum_word_dictionary.LEXICON_CATEGORIES) + ['original']
+
+# Trailing partial word of a chunk, carried over to the next one
+_TRAILING_WORD = re.compile(r'\w+\Z')
+
+def iter_corpus_files(paths, extensions=DEFAULT_EXTENSIONS):
+    """Yield files from the given paths, walking directories for matching extensions."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(extensions):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def iter_text_chunks(files, chunk_chars=DEFAULT_CHUNK_CHARS):
+    """
+    Yield text chunks of about chunk_chars characters from each file.
+    Chunks never split a word: a trailing partial word moves to the next chunk,
+    and a chunk that is all one word keeps growing until the word ends (or
+    exceeds MAX_WORD_CHARS).
+    """
+    for path in files:
+        carry = ''
+        with open(path, encoding='utf-8', errors='replace') as f:
+            while True:
+                block = f.read(chunk_chars)
+                if not block:
+                    break
+                text = carry + block
+                match = _TRAILING_WORD.search(text)
+                if match is None:
+                    carry = ''
+                elif match.start() > 0:
+                    carry = text[match.start():]
+                    text = text[:match.start()]
+                elif len(text) <= MAX_WORD_CHARS:
+                    carry = text
+                    continue
+                else:
+                    carry = ''
+                yield text
+        if carry:
+            yield carry
+
+def _init_worker(lexicon_path):
+    if lexicon_path:
+        quantum_word_dictionary.reload_lexicon(lexicon_path)
+
+def count_chunk(text):
+    """
+    Count categories and uncategorized words in one chunk (runs in a worker process).
+
+    Returns:
+        tuple: (category Counter, uncategorized word Counter)
+    """
+    category_counts = Counter()
+    uncategorized = Counter()
+    for word, category in quantum_word_dictionary.iter_categorized_words(text):
+        category_counts[category] += 1
+        if category == 'original':
+            uncategorized[word] += 1
+    return category_counts, uncategorized
+
+class CoverageAccumulator:
+    """
+    Merges chunk counters. The uncategorized vocabulary is pruned to its most
+    frequent max_tracked words whenever it doubles, which bounds memory; counts
+    for words near the cut-off may then be slight underestimates.
+    """
+
+    def __init__(self, max_tracked=50000):
+        self.max_tracked = max_tracked
+        self.category_counts = Counter()
+        self.uncategorized = Counter()
+        self.chunks = 0
+        self.pruned = False
+
+    def add(self, category_counts, uncategorized):
+        self.chunks += 1
+        self.category_counts.update(category_counts)
+        self.uncategorized.update(uncategorized)
+        if len(self.uncategorized) > 2 * self.max_tracked:
+            self.uncategorized = Counter(dict(self.uncategorized.most_common(self.max_tracked)))
+            self.pruned = True
+
+    def report(self, top=20):
+        total_words = sum(self.category_counts.values())
+        quantum_words = total_words - self.category_counts['original']
+        coverage_percent = (quantum_words / total_words * 100) if total_words > 0 else 0
+        return {
+            'lexicon_version': quantum_word_dictionary.get_lexicon_info()['version'],
+            'chunks': self.chunks,
+            'total_words': total_words,
+            'quantum_words': quantum_words,
+            'coverage_percent': round(coverage_percent, 1),
+            'category_counts': {category: self.category_counts[category] for category in CATEGORIES},
+            'top_uncategorized': self.uncategorized.most_common(top),
+            'uncategorized_counts_approximate': self.pruned
+        }
+
+def audit_corpus(paths, workers=None, chunk_chars=DEFAULT_CHUNK_CHARS, max_tracked=50000,
+                 lexicon_path=None, extensions=DEFAULT_EXTENSIONS):
+    """
+    Run the coverage audit over files and directories.
+
+    Returns:
+        CoverageAccumulator: merged counters
+    """
+    accumulator = CoverageAccumulator(max_tracked)
+    chunks = iter_text_chunks(iter_corpus_files(paths, extensions), chunk_chars)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        if lexicon_path:
+            _init_worker(lexicon_path)
+        for chunk in chunks:
+            accumulator.add(*count_chunk(chunk))
+        return accumulator
+
+    # Keep a bounded window of chunks in flight so the reader never runs far ahead
+    window = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(lexicon_path,)) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(count_chunk, chunk))
+            if len(pending) >= window:
+                accumulator.add(*pending.pop(0).result())
+        for future in pending:
+            accumulator.add(*future.result())
+    return accumulator
+
+def print_report(report):
+    print("🧪 QUANTUM CORPUS COVERAGE AUDIT")
+    print("=" * 50)
+    print(f"📚 Lexicon version: {report['lexicon_version']}")
+    print(f"📊 Total words: {report['total_words']}  ({report['chunks']} chunks)")
+    print(f"   Quantum words: {report['quantum_words']}")
+    print(f"   Coverage: {report['coverage_percent']}%")
+    print()
+    print("🎭 Category Distribution:")
+    for category, count in report['category_counts'].items():
+        print(f"   {category}: {count} words")
+    print()
+    approximate = ' (approximate)' if report['uncategorized_counts_approximate'] else ''
+    print(f"🔍 Most frequent uncategorized words{approximate}:")
+    for word, count in report['top_uncategorized']:
+        print(f"   {word}: {count}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Audit quantum word coverage across story text files.')
+    parser.add_argument('paths', nargs='+', help='Text files or directories to scan')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-chars', type=int, default=DEFAULT_CHUNK_CHARS, help='Characters per chunk')
+    parser.add_argument('--top', type=int, default=20, help='Number of uncategorized words to list')
+    parser.add_argument('--max-tracked', type=int, default=50000,
+                        help='Uncategorized vocabulary size kept between prunes')
+    parser.add_argument('--lexicon', default=None, help='Lexicon file (default: quantum_lexicon.json)')
+    parser.add_argument('--extensions', default=','.join(DEFAULT_EXTENSIONS),
+                        help='File extensions to include when scanning directories')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    if args.lexicon and not quantum_word_dictionary.reload_lexicon(args.lexicon):
+        return 1
+
+    extensions = tuple(ext.strip().lower() for ext in args.extensions.split(',') if ext.strip())
+    accumulator = audit_corpus(args.paths, args.workers, args.chunk_chars, args.max_tracked,
+                               args.lexicon, extensions)
+    report = accumulator.report(args.top)
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
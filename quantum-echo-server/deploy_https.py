@@ -12,21 +12,26 @@ import sys
 
 # Import your app
 try:
-    from app import app
+    from app import app, start_snapshots, start_websocket_channel
+    from run_websocket import build_ssl_context
 except ImportError:
     print("Error: Could not import app from app.py")
     sys.exit(1)
 
 def create_self_signed_cert():
-    """Create a self-signed certificate for testing HTTPS locally"""
+    """
+    SSL context from cert.pem/key.pem, or a temporary self-signed one.
+    The same context serves HTTPS and wss://, so both use the same certificate.
+    """
     try:
-        import ssl
-        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
-        context.load_cert_chain('cert.pem', 'key.pem')
-        return context
-    except FileNotFoundError:
+        return build_ssl_context('cert.pem', 'key.pem')
+    except ValueError:
         print("SSL certificates not found. Creating self-signed certificate...")
-        return 'adhoc'  # This will create a temporary self-signed cert
+    try:
+        return build_ssl_context(adhoc=True)
+    except ValueError as e:
+        print(f"Could not create a self-signed certificate: {e}")
+        return None
 
 def run_https_server():
     """Run the Flask server with HTTPS"""
@@ -34,12 +39,20 @@ def run_https_server():
     print("Server will be available at: https://108.175.12.95:8000")
     print("Note: For production, use proper SSL certificates!")
     
+    start_snapshots()
+    ssl_context = create_self_signed_cert()
+    # Never serve session traffic as plain ws:// next to the HTTPS site
+    if ssl_context is not None:
+        start_websocket_channel(ssl_context)
+    else:
+        print("[WebSocket] ⚠️ Not started: no TLS certificate for wss://")
+    
     try:
-        # For production, replace 'adhoc' with proper SSL context
+        # For production, put proper certificates in cert.pem/key.pem
         app.run(
             host='0.0.0.0', 
             port=8000, 
-            ssl_context='adhoc',  # Creates temporary self-signed cert
+            ssl_context=ssl_context or 'adhoc',
             debug=False  # Set to False for production
         )
     except Exception as e:
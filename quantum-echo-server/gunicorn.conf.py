@@ -0,0 +1,20 @@
+# gunicorn.conf.py
+# 🦄 SINGLE-PROCESS GUNICORN CONFIGURATION
+#
+# Loaded automatically by `gunicorn wsgi:app` from this directory.
+#
+# Player session registers, rate-limit buckets, admission slots and caches all
+# live in process memory. With several workers a player's /quantum_gate and
+# /quantum_text calls land on different registers, and every per-process limit
+# is multiplied by the worker count. So one worker serves all requests on
+# threads; to scale out, run more instances behind a proxy that routes each
+# player to the same instance.
+
+import os
+
+bind = os.environ.get('QUANTUM_BIND', '0.0.0.0:8000')
+workers = 1
+worker_class = 'gthread'
+# Enough threads for every in-flight and queued simulation, so admission control
+# decides who waits, plus a few for cheap endpoints such as /health and /metrics
+threads = int(os.environ.get('QUANTUM_MAX_IN_FLIGHT', 4)) + int(os.environ.get('QUANTUM_MAX_QUEUE', 16)) + 4
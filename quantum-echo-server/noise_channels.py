@@ -0,0 +1,121 @@
+# noise_channels.py
+# 🌫️ DECOHERENCE EFFECTS FROM CACHED NOISE CHANNELS
+#
+# Memory fragmentation and decoherence effects use real qiskit-aer noise
+# channels (depolarizing, amplitude damping, dephasing), but a noisy density
+# matrix simulation per word would be far too slow. Instead each channel is
+# evaluated once at startup for a grid of strengths, and the results are kept
+# as small tables:
+#
+# - flip[level, bit]: probability that a character qubit prepared in |bit>
+#   (lowercase → |0>, uppercase → |1>) is measured in the other state
+# - coherence[level]: remaining superposition 2|ρ01| of a |+> probe
+#   (1 = fully coherent, 0 = fully decohered)
+#
+# Transforming text is then a table lookup plus one vectorized random draw per
+# character.
+
+import os
+
+import numpy as np
+from qiskit.quantum_info import DensityMatrix, Kraus
+from qiskit_aer.noise import amplitude_damping_error, depolarizing_error, phase_damping_error
+
+NOISE_LEVELS = int(os.environ.get('QUANTUM_NOISE_LEVELS', 11))
+NOISE_MAX_STRENGTH = float(os.environ.get('QUANTUM_NOISE_MAX_STRENGTH', 1.0))
+
+NOISE_CHANNELS = {
+    'depolarizing': lambda strength: depolarizing_error(strength, 1),
+    'amplitude_damping': amplitude_damping_error,
+    'dephasing': phase_damping_error
+}
+
+# Godot QuantumMemoryType → channel
+MEMORY_TYPE_CHANNELS = {
+    'fragmented': 'amplitude_damping',  # memories decay towards the ground state
+    'entangled': 'depolarizing',        # entangled with the environment, scrambled
+    'superposition': 'dephasing'        # populations survive, phase coherence fades
+}
+
+# Glyphs for characters that both flipped and lost coherence
+FRAGMENT_GLYPH = '░'
+FADED_CHARS = {
+    'a': 'ā', 'e': 'ē', 'i': 'ī', 'o': 'ō', 'u': 'ū', 'y': 'ÿ',
+    'A': 'Ā', 'E': 'Ē', 'I': 'Ī', 'O': 'Ō', 'U': 'Ū', 'Y': 'Ÿ',
+    'n': 'ñ', 'N': 'Ñ', 'c': 'ç', 'C': 'Ç', 's': 'š', 'S': 'Š'
+}
+
+class NoiseTable:
+    """Precomputed measurement statistics of one noise channel over a strength grid."""
+
+    def __init__(self, channel, strengths):
+        self.channel = channel
+        self.strengths = strengths
+        self.flip = np.zeros((len(strengths), 2))
+        self.coherence = np.zeros(len(strengths))
+
+        probes = [DensityMatrix.from_label('0'), DensityMatrix.from_label('1')]
+        plus = DensityMatrix.from_label('+')
+        for level, strength in enumerate(strengths):
+            kraus = Kraus(NOISE_CHANNELS[channel](float(strength)).to_quantumchannel())
+            for bit, probe in enumerate(probes):
+                self.flip[level, bit] = probe.evolve(kraus).probabilities()[1 - bit]
+            self.coherence[level] = 2 * abs(plus.evolve(kraus).data[0, 1])
+
+    def level_for(self, intensity):
+        """Index of the strength level closest to an intensity in [0, 1]."""
+        intensity = min(max(float(intensity), 0.0), 1.0)
+        return int(round(intensity * (len(self.strengths) - 1)))
+
+def build_noise_tables(levels=NOISE_LEVELS, max_strength=NOISE_MAX_STRENGTH):
+    """Evaluate every channel once over `levels` strengths from 0 to max_strength."""
+    strengths = np.linspace(0.0, max_strength, levels)
+    return {channel: NoiseTable(channel, strengths) for channel in NOISE_CHANNELS}
+
+NOISE_TABLES = build_noise_tables()
+
+def apply_noise_transformation(text, channel, intensity, rng=None):
+    """
+    Apply a decoherence effect to every letter of text.
+
+    Per character, with the channel's probabilities at this intensity:
+    - flipped and decohered → fragment glyph (the memory is lost)
+    - flipped only → case swap (amplitude damping turns capitals lowercase)
+    - decohered only → faded diacritic
+    - otherwise unchanged
+
+    Returns:
+        tuple: (transformed text, coherence remaining at this intensity)
+    """
+    table = NOISE_TABLES[channel]
+    level = table.level_for(intensity)
+    rng = rng if rng is not None else np.random.default_rng()
+
+    chars = list(text)
+    letters = np.array([c.isalpha() for c in chars], dtype=bool)
+    upper = np.array([c.isupper() for c in chars], dtype=np.intp)
+
+    flip_p = table.flip[level][upper]
+    flipped = (rng.random(len(chars)) < flip_p) & letters
+    decohered = (rng.random(len(chars)) < 1 - table.coherence[level]) & letters
+
+    for i in np.flatnonzero(flipped | decohered):
+        char = chars[i]
+        if flipped[i] and decohered[i]:
+            chars[i] = FRAGMENT_GLYPH
+        elif flipped[i]:
+            chars[i] = char.swapcase()
+        else:
+            chars[i] = FADED_CHARS.get(char, char)
+    return ''.join(chars), float(table.coherence[level])
+
+def get_noise_stats():
+    """Summary of the cached channel tables."""
+    return {
+        channel: {
+            'levels': len(table.strengths),
+            'max_strength': float(table.strengths[-1]),
+            'coherence': [round(float(c), 3) for c in table.coherence]
+        }
+        for channel, table in NOISE_TABLES.items()
+    }
@@ -0,0 +1,180 @@
+# prefetch.py
+# 🔮 SPECULATIVE PREFETCH OF UPCOMING DIALOGUE
+#
+# The dialogue graph is known ahead of time, so the texts a player can reach
+# next can be transformed before they are requested. A background worker takes
+# texts from a priority queue (nearest branches first) and stores the results in
+# a bounded cache that the live request path consumes.
+#
+# Each client has a prefetch group. Submitting a new set of texts for a group,
+# or cancelling it, bumps the group's generation and removes the group's queued
+# items (branches the player moved away from), so they never take queue space
+# from live branches. An item whose group moved on while it waited for a
+# simulation slot is dropped unprocessed.
+# The worker only runs when a simulation slot is free, so live requests always
+# come first.
+#
+# A submission can carry a context (e.g. the player's qubit state) that is passed
+# to the work and key functions, so results conditioned on it are only served
+# back to requests with the same context.
+
+from collections import OrderedDict
+import heapq
+import itertools
+import threading
+import time
+
+class Prefetcher:
+    """Priority-queued background work with per-group cancellation and a bounded result cache."""
+
+    def __init__(self, work, key_fn, try_acquire, release, max_queue=256, max_results=512, max_groups=10000):
+        self.work = work                # (text, context) → value to cache
+        self.key_fn = key_fn            # (text, context) → cache key
+        self.try_acquire = try_acquire  # non-blocking claim of a simulation slot
+        self.release = release
+        self.max_queue = max_queue
+        self.max_results = max_results
+        self.max_groups = max_groups
+
+        self._queue = []                # heap of (priority, seq, group, generation, text, context)
+        self._sequence = itertools.count()
+        self._generations = OrderedDict()
+        self._results = OrderedDict()
+        self._condition = threading.Condition()
+        self._thread = None
+
+        self.submitted = 0
+        self.dropped_queue_full = 0
+        self.cancelled = 0
+        self.completed = 0
+        self.skipped_cached = 0
+        self.errors = 0
+        self.hits = 0
+        self.misses = 0
+
+    def submit(self, group, texts, context=None):
+        """
+        Replace a group's pending prefetches with new texts.
+
+        Args:
+            group (str): Prefetch group (usually the player's session)
+            texts (list): (priority, text) pairs, lower priority values run first
+            context: Passed to the work and key functions with each text
+
+        Returns:
+            int: Number of texts queued
+        """
+        with self._condition:
+            generation = self._bump(group)
+            queued = 0
+            for priority, text in texts:
+                if len(self._queue) >= self.max_queue:
+                    self.dropped_queue_full += 1
+                    continue
+                heapq.heappush(self._queue, (priority, next(self._sequence), group, generation, text, context))
+                queued += 1
+            self.submitted += queued
+            self._condition.notify()
+            return queued
+
+    def cancel(self, group):
+        """Drop everything still queued for a group."""
+        with self._condition:
+            self._bump(group)
+
+    def _bump(self, group):
+        remaining = [item for item in self._queue if item[2] != group]
+        if len(remaining) != len(self._queue):
+            self.cancelled += len(self._queue) - len(remaining)
+            heapq.heapify(remaining)
+            self._queue = remaining
+        generation = self._generations.pop(group, 0) + 1
+        self._generations[group] = generation
+        while len(self._generations) > self.max_groups:
+            self._generations.popitem(last=False)
+        return generation
+
+    def take(self, key):
+        """Remove and return a prefetched value, or None. Each value is served once."""
+        with self._condition:
+            value = self._results.pop(key, None)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def _next_item(self):
+        with self._condition:
+            while True:
+                while not self._queue:
+                    self._condition.wait()
+                priority, _, group, generation, text, context = heapq.heappop(self._queue)
+                if self._is_stale(group, generation):
+                    continue
+                return group, generation, text, context
+
+    def _is_stale(self, group, generation):
+        if self._generations.get(group) != generation:
+            self.cancelled += 1
+            return True
+        return False
+
+    def _run(self):
+        while True:
+            group, generation, text, context = self._next_item()
+            key = self.key_fn(text, context)
+            with self._condition:
+                if key in self._results:
+                    self.skipped_cached += 1
+                    continue
+
+            # Background work yields to live requests for simulation slots
+            while not self.try_acquire():
+                time.sleep(0.05)
+            # The player may have moved on while the worker waited for a slot
+            with self._condition:
+                stale = self._is_stale(group, generation)
+            if stale:
+                self.release()
+                continue
+            try:
+                value = self.work(text, context)
+            except Exception as e:
+                print(f"[Prefetch] ❌ ERROR prefetching text: {e}")
+                with self._condition:
+                    self.errors += 1
+                continue
+            finally:
+                self.release()
+
+            with self._condition:
+                self._results[key] = value
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+                self.completed += 1
+
+    def start(self):
+        """Start the background worker thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='prefetch-worker', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stats(self):
+        with self._condition:
+            return {
+                'queued': len(self._queue),
+                'max_queue': self.max_queue,
+                'cached_results': len(self._results),
+                'max_results': self.max_results,
+                'submitted': self.submitted,
+                'dropped_queue_full': self.dropped_queue_full,
+                'cancelled': self.cancelled,
+                'completed': self.completed,
+                'skipped_cached': self.skipped_cached,
+                'errors': self.errors,
+                'hits': self.hits,
+                'misses': self.misses
+            }
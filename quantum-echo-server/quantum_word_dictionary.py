@@ -2,7 +2,7 @@
 # 🌟 COMPREHENSIVE QUANTUM WORD DICTIONARY FOR SERVER-SIDE PROCESSING
 # 
 # This dictionary categorizes ALL words from the "Echoes of Light" story text
-# into 7 quantum transformation categories, each using real qiskit quantum circuits:
+# into 8 quantum transformation categories, each using real qiskit quantum circuits:
 #
 # BASIC TRANSFORMATIONS (using quantum_echo function):
 # - SCRAMBLE: Hadamard gates + quantum measurement for randomization
@@ -14,206 +14,255 @@
 # - QUANTUM_GATES: Custom gate sequences (H, X, Y, Z, ROT)
 # - QUANTUM_ENTANGLEMENT: Multi-qubit entanglement circuits
 # - QUANTUM_MEMORY: Quantum memory fragmentation with intensity control
+# - QUANTUM_DECOHERENCE: Cached noise channels (depolarizing, amplitude damping, dephasing)
+#
+# The word lists live in quantum_lexicon.json (categories in priority order).
+# The file is validated and compiled into a single word -> category table, and
+# a background watcher recompiles it whenever the file changes, swapping the new
+# table in atomically so in-flight requests keep the lexicon they started with.
 
-# 🧠 MEMORY & CONSCIOUSNESS WORDS → QUANTUM_MEMORY (Advanced)
-# Words related to memory, consciousness, time, and recollection
-# Uses quantum_memory endpoint with fragmentation/entanglement effects
-QUANTUM_MEMORY_WORDS = {
-    'memory', 'memories', 'remember', 'forgot', 'forgotten', 'recall', 'recalling',
-    'past', 'history', 'lost', 'gone', 'disappeared', 'missing', 'vanished',
-    'vanishing', 'fading', 'fade', 'fades', 'dim', 'silent', 'silence',
-    'trace', 'traces', 'hidden', 'buried', 'pulled', 'back', 'echo', 'echoes',
-    'whisper', 'whispers', 'murmur', 'murmurs', 'voices', 'voice', 'messages',
-    'beneath', 'surface', 'faint', 'fragile', 'fragments', 'fragment',
-    'extinguished', 'beckons', 'listen', 'gather', 'gathered', 'knowledge',
-    'remembered', 'partially', 'dreams', 'despair', 'limbo', 'waiting',
-    'remembrance', 'boundary', 'oblivion', 'once', 'might', 'been',
-    'intertwined', 'webs', 'consciousness', 'awareness', 'mind', 'thought',
-    'thoughts', 'forgotten', 'afterglow', 'moments', 'moment', 'resurrect',
-    'resurrection', 'revival', 'revive', 'reclaim', 'reclaiming', 'reshape',
-    'reshaping', 'data', 'information', 'trapped', 'stored', 'imprint'
-}
+import hashlib
+import json
+import os
+import re
+import threading
+import time
 
-# 👻 QUANTUM & SCIENTIFIC PHENOMENA → GHOST (Basic)
-# Words related to quantum physics, light, energy, and scientific phenomena
-# Uses quantum_echo with Y rotation gates for spectral effects
-GHOST_WORDS = {
-    'quantum', 'light', 'burst', 'bursts', 'brilliant', 'glow', 'glowing',
-    'flickering', 'flicker', 'faintly', 'slowly', 'leaving', 'pulse',
-    'pulses', 'pulsing', 'signal', 'signals', 'energy', 'wave', 'waves',
-    'particle', 'particles', 'field', 'fields', 'resonance', 'frequency',
-    'frequencies', 'interference', 'superposition', 'entanglement', 'coherence',
-    'decoherence', 'collapse', 'measurement', 'measurements', 'circuit',
-    'circuits', 'gate', 'gates', 'operation', 'operations', 'effect',
-    'effects', 'phenomenon', 'phenomena', 'superconductor', 'superconductors',
-    'superconducting', 'higgs', 'signature', 'signatures', 'state', 'states',
-    'amplitudes', 'amplitude', 'qubits', 'qubit', 'feedback', 'fractures',
-    'fracture', 'reality', 'realities', 'timelines', 'timeline', 'parallel',
-    'alternate', 'dimension', 'dimensions', 'space', 'time', 'continuum',
-    'echo-tech', 'processor', 'computing', 'technology', 'beam', 'beams',
-    'ray', 'rays', 'emission', 'spectrum', 'wavelength', 'photon', 'photons'
-}
+LEXICON_PATH = os.environ.get(
+    'QUANTUM_LEXICON_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quantum_lexicon.json')
+)
+LEXICON_POLL_SECONDS = float(os.environ.get('QUANTUM_LEXICON_POLL_SECONDS', 2.0))
 
-# 🤖 TECHNOLOGY & AI SYSTEMS → QUANTUM_CAPS (Basic)
-# Words related to technology, AI, computing, and technical systems
-# Uses quantum_echo with mixed H and Z gates for technical emphasis
-QUANTUM_CAPS_WORDS = {
-    'novacore', 'ava', 'ai', 'assistant', 'system', 'systems', 'processing',
-    'processor', 'neural', 'digital', 'computer', 'computers', 'computing',
-    'analysis', 'analyze', 'calculation', 'calculate', 'protocol', 'protocols',
-    'interface', 'interfaces', 'network', 'networks', 'diagnostic', 'diagnostics',
-    'error', 'errors', 'warning', 'warnings', 'stable', 'stability', 'unstable',
-    'crash', 'crashes', 'crashed', 'instruments', 'instrument', 'register',
-    'registers', 'capture', 'captured', 'equipment', 'console', 'consoles',
-    'lab', 'laboratory', 'experiment', 'experiments', 'experimenting',
-    'secure', 'security', 'doors', 'scientists', 'scientist', 'catalog',
-    'cataloging', 'excited', 'massive', 'holograms', 'hologram', 'technical',
-    'achievement', 'achievements', 'barriers', 'barrier', 'surpassed',
-    'monumental', 'stabilize', 'stabilizing', 'sensor', 'sensors', 'precise',
-    'precision', 'timing', 'unpredictable', 'device', 'devices', 'machine',
-    'machines', 'machinery', 'apparatus', 'control', 'controls', 'controlled',
-    'monitor', 'monitoring', 'display', 'displays', 'screen', 'screens'
+# Lexicon category name → transformation category returned by the categorizer
+LEXICON_CATEGORIES = {
+    'quantum_memory': 'quantum_interference',
+    'quantum_decoherence': 'quantum_decoherence',
+    'quantum_gates': 'quantum_gates',
+    'quantum_entanglement': 'quantum_entanglement',
+    'ghost': 'ghost',
+    'quantum_caps': 'quantum_caps',
+    'scramble': 'scramble',
+    'reverse': 'reverse'
 }
+# Transformation category → lexicon category name used in coverage reports
+TRANSFORMATION_CATEGORIES = {transformation: category for category, transformation in LEXICON_CATEGORIES.items()}
 
-# 🔬 ADVANCED QUANTUM OPERATIONS → QUANTUM_GATES (Advanced)  
-# Words related to complex quantum operations and gate sequences
-# Uses quantum_gates endpoint with custom H-X-Y-Z-ROT sequences
-QUANTUM_GATES_WORDS = {
-    'bit_flip', 'phase_flip', 'rotate', 'rotation', 'hadamard', 'pauli',
-    'unitary', 'matrix', 'matrices', 'eigenvalue', 'eigenvector', 'basis',
-    'computational', 'transform', 'transformation', 'transformations',
-    'sequence', 'sequences', 'apply', 'applied', 'applying', 'gate',
-    'gates', 'operation', 'operations', 'quantum', 'circuit', 'circuits',
-    'algorithm', 'algorithms', 'complexity', 'optimization', 'optimization',
-    'encode', 'encoding', 'decode', 'decoding', 'process', 'processes',
-    'processing', 'manipulation', 'manipulate', 'manipulating', 'control',
-    'controlled', 'precision', 'accurate', 'calibrate', 'calibration',
-    'fine-tune', 'adjustment', 'parameters', 'parameter', 'variables',
-    'variable', 'function', 'functions', 'execute', 'execution', 'run',
-    'simulate', 'simulation', 'model', 'modeling', 'calculate', 'computation'
-}
+class CompiledLexicon:
+    """Immutable, compiled form of quantum_lexicon.json."""
+    
+    def __init__(self, category_words, source_path, version, compile_ms):
+        self.category_words = category_words  # lexicon category → frozenset of words
+        self.source_path = source_path
+        self.version = version
+        self.compile_ms = compile_ms
+        self.loaded_at = time.time()
+        
+        # Resolve priorities once so categorizing a word is a single dict lookup
+        self.word_categories = {}
+        for category, words in category_words.items():
+            transformation = LEXICON_CATEGORIES[category]
+            for word in words:
+                self.word_categories.setdefault(word, transformation)
+    
+    def categorize(self, word):
+        return self.word_categories.get(word.lower().strip(), 'original')
 
-# ⚡ ENTANGLEMENT & CORRELATION → QUANTUM_ENTANGLEMENT (Advanced)
-# Words related to connections, relationships, and correlated phenomena  
-# Uses quantum_entanglement endpoint with multi-qubit entanglement circuits
-QUANTUM_ENTANGLEMENT_WORDS = {
-    'connection', 'connections', 'connected', 'linking', 'linked', 'bind',
-    'binding', 'bound', 'together', 'paired', 'pairs', 'correlation',
-    'correlations', 'correlated', 'relationship', 'relationships', 'bond',
-    'bonds', 'bonding', 'sync', 'synchronized', 'harmony', 'harmonized',
-    'unified', 'unite', 'unity', 'merge', 'merged', 'merging', 'combine',
-    'combined', 'combining', 'intertwined', 'entangled', 'entanglement',
-    'coupled', 'coupling', 'shared', 'sharing', 'communicate', 'communication',
-    'communicating', 'telepathic', 'instant', 'instantaneous', 'simultaneous',
-    'across', 'between', 'among', 'throughout', 'network', 'web', 'matrix',
-    'fabric', 'threads', 'thread', 'woven', 'weaving', 'pattern', 'patterns',
-    'resonant', 'resonating', 'vibration', 'vibrations', 'frequency', 'tune',
-    'tuned', 'attuned', 'alignment', 'aligned', 'coherent', 'coherence',
-    'interference', 'constructive', 'destructive', 'phase', 'phases'
-}
+def compile_lexicon(path):
+    """
+    Load, validate and compile a lexicon file.
+    
+    Raises:
+        ValueError: If the file is not a valid lexicon
+    """
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        raw = f.read()
+    
+    try:
+        data = json.loads(raw.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f'Lexicon {path} is not valid JSON: {e}')
+    
+    categories = data.get('categories') if isinstance(data, dict) else None
+    if not isinstance(categories, list):
+        raise ValueError(f"Lexicon {path} has no 'categories' list")
+    
+    category_words = {}
+    for entry in categories:
+        name = entry.get('name') if isinstance(entry, dict) else None
+        if name not in LEXICON_CATEGORIES:
+            raise ValueError(f'Lexicon {path} has unknown category: {name!r}')
+        if name in category_words:
+            raise ValueError(f'Lexicon {path} lists category {name!r} twice')
+        if entry.get('transformation', LEXICON_CATEGORIES[name]) != LEXICON_CATEGORIES[name]:
+            raise ValueError(f'Lexicon {path}: category {name!r} must use transformation '
+                             f'{LEXICON_CATEGORIES[name]!r}')
+        words = entry.get('words')
+        if not isinstance(words, list) or not all(isinstance(w, str) and w.strip() for w in words):
+            raise ValueError(f'Lexicon {path}: category {name!r} needs a list of non-empty words')
+        category_words[name] = frozenset(w.lower().strip() for w in words)
+    
+    missing = set(LEXICON_CATEGORIES) - set(category_words)
+    if missing:
+        raise ValueError(f'Lexicon {path} is missing categories: {sorted(missing)}')
+    
+    version = f"{data.get('version', 0)}-{hashlib.sha256(raw).hexdigest()[:12]}"
+    compile_ms = (time.perf_counter() - started) * 1000
+    return CompiledLexicon(category_words, path, version, compile_ms)
 
-# 💥 EMOTIONAL & DRAMATIC TENSION → SCRAMBLE (Basic)
-# Words conveying emotion, tension, drama, and intense moments
-# Uses quantum_echo with Hadamard gates for dramatic randomization
-SCRAMBLE_WORDS = {
-    'tension', 'tense', 'etched', 'face', 'faces', 'panicked', 'panic',
-    'run', 'running', 'swallowed', 'blink', 'blinking', 'fear', 'fears',
-    'afraid', 'scared', 'breathing', 'breathe', 'down', 'neck', 'pressure',
-    'locked', 'lock', 'away', 'behind', 'heavy', 'doors', 'trapped',
-    'hard', 'difficult', 'struggle', 'struggling', 'managed', 'manage',
-    'finally', 'at_last', 'today', 'need', 'needs', 'right', 'correct',
-    'choose', 'choice', 'choices', 'decision', 'decisions', 'steady',
-    'hands', 'hand', 'initiate', 'start', 'begin', 'fails', 'fail',
-    'failure', 'vanishes', 'vanish', 'ghost', 'ghosts', 'ghostly',
-    'realities', 'strong', 'strength', 'enough', 'sufficient', 'caution',
-    'careful', 'best', 'optimal', 'critical', 'crash', 'crashes',
-    'entire', 'whole', 'complete', 'fixing', 'fix', 'repair', 'risk',
-    'risks', 'risky', 'dangerous', 'anyway', 'regardless', 'unstable',
-    'proceed', 'continue', 'forward', 'dreams', 'dream', 'nightmare',
-    'despair', 'hopeless', 'melancholy', 'sad', 'sadness', 'seeps',
-    'deep', 'profound', 'testament', 'witness', 'limbo', 'stuck',
-    'fragile', 'delicate', 'nature', 'essence', 'blurs', 'blur',
-    'confused', 'awed', 'amazed', 'complex', 'complicated', 'emerge',
-    'emerging', 'multiple', 'many', 'several', 'branching', 'branch',
-    'possibilities', 'possible', 'hearts', 'heart', 'pounding', 'beat',
-    'anticipation', 'anticipate', 'waiting', 'whispered', 'whisper',
-    'across', 'space', 'distance', 'proof', 'evidence', 'beginning',
-    'start', 'commence', 'urgent', 'urgency', 'immediate', 'crisis',
-    'emergency', 'alarm', 'warning', 'threat', 'danger', 'perilous'
+# Small built-in lexicon used when quantum_lexicon.json is missing or invalid at startup
+FALLBACK_CATEGORY_WORDS = {
+    'quantum_memory': ['memory', 'remember', 'forgotten', 'echo', 'past'],
+    'quantum_decoherence': ['decay', 'static', 'noise', 'glitch', 'entropy'],
+    'quantum_gates': ['quantum', 'gate', 'circuit', 'pulse', 'energy', 'signal', 'phase', 'collapse'],
+    'quantum_entanglement': ['belief', 'hope', 'light', 'moment', 'time', 'reality', 'truth', 'darkness'],
+    'ghost': ['ghost', 'shadow', 'faint', 'vanished', 'flickering'],
+    'quantum_caps': ['experiment', 'lab', 'console', 'security'],
+    'scramble': ['through', 'over', 'under', 'next', 'just', 'even'],
+    'reverse': ['back', 'return', 'again', 'before']
 }
 
-# 🌀 COMMON STORY WORDS → REVERSE (Basic)
-# High-frequency words that appear throughout the narrative
-# Uses quantum_echo with X gates and controlled operations for case reversal
-REVERSE_WORDS = {
-    'that', 'was', 'three', 'days', 'ago', 'and', 'you', 'theo', 'have',
-    'been', 'the', 'are', 'will', 'can', 'this', 'with', 'your', 'but',
-    'for', 'not', 'all', 'any', 'had', 'her', 'his', 'how', 'its', 'may',
-    'new', 'old', 'see', 'two', 'who', 'did', 'has', 'let', 'put', 'say',
-    'she', 'too', 'use', 'here', 'there', 'where', 'when', 'why', 'what',
-    'which', 'each', 'than', 'them', 'these', 'those', 'would', 'could',
-    'should', 'their', 'they', 'we', 'our', 'us', 'him', 'if', 'or',
-    'as', 'at', 'be', 'by', 'do', 'go', 'he', 'i', 'in', 'is', 'it',
-    'me', 'my', 'no', 'of', 'on', 'so', 'to', 'up', 'an', 'am', 'one',
-    'first', 'last', 'next', 'then', 'now', 'before', 'after', 'during',
-    'while', 'until', 'since', 'from', 'into', 'onto', 'upon', 'over',
-    'under', 'through', 'around', 'between', 'among', 'within', 'without',
-    'about', 'above', 'below', 'near', 'far', 'left', 'right', 'front',
-    'back', 'side', 'top', 'bottom', 'inside', 'outside', 'around',
-    'towards', 'away', 'against', 'along', 'across', 'beyond', 'behind',
-    'beside', 'beneath', 'above', 'below', 'off', 'out', 'down', 'forward'
-}
+def _fallback_lexicon(path):
+    category_words = {category: frozenset(FALLBACK_CATEGORY_WORDS.get(category, ()))
+                      for category in LEXICON_CATEGORIES}
+    return CompiledLexicon(category_words, path, 'builtin', 0.0)
+
+# A missing or invalid lexicon file must not stop the server: start with the built-in
+# words and let the watcher load the file once it is fixed
+try:
+    _active_lexicon = compile_lexicon(LEXICON_PATH)
+    _startup_error = None
+except (OSError, ValueError) as e:
+    _active_lexicon = _fallback_lexicon(LEXICON_PATH)
+    _startup_error = str(e)
+    print(f"[Lexicon] ❌ Could not load {LEXICON_PATH}, using the built-in fallback words: {e}")
+_reload_lock = threading.Lock()
+_reload_stats = {'reloads': 0, 'last_reload_ms': _active_lexicon.compile_ms, 'last_error': _startup_error}
+
+def get_active_lexicon():
+    """Return the current lexicon. Hold on to it to categorize a whole text consistently."""
+    return _active_lexicon
+
+def _bind_category_sets(lexicon):
+    """Keep the module-level word sets pointing at the active lexicon."""
+    global QUANTUM_MEMORY_WORDS, GHOST_WORDS, QUANTUM_CAPS_WORDS, QUANTUM_GATES_WORDS
+    global QUANTUM_ENTANGLEMENT_WORDS, SCRAMBLE_WORDS, REVERSE_WORDS, QUANTUM_DECOHERENCE_WORDS
+    QUANTUM_MEMORY_WORDS = lexicon.category_words['quantum_memory']
+    QUANTUM_DECOHERENCE_WORDS = lexicon.category_words['quantum_decoherence']
+    GHOST_WORDS = lexicon.category_words['ghost']
+    QUANTUM_CAPS_WORDS = lexicon.category_words['quantum_caps']
+    QUANTUM_GATES_WORDS = lexicon.category_words['quantum_gates']
+    QUANTUM_ENTANGLEMENT_WORDS = lexicon.category_words['quantum_entanglement']
+    SCRAMBLE_WORDS = lexicon.category_words['scramble']
+    REVERSE_WORDS = lexicon.category_words['reverse']
+
+_bind_category_sets(_active_lexicon)
+
+def reload_lexicon(path=None):
+    """
+    Compile the lexicon file and swap it in.
+    
+    On a validation error the current lexicon stays active and the error is recorded.
+    
+    Returns:
+        bool: True if a new lexicon was swapped in
+    """
+    global _active_lexicon
+    path = path or _active_lexicon.source_path
+    with _reload_lock:
+        try:
+            lexicon = compile_lexicon(path)
+        except (OSError, ValueError) as e:
+            _reload_stats['last_error'] = str(e)
+            print(f"[Lexicon] ❌ Reload failed, keeping version {_active_lexicon.version}: {e}")
+            return False
+        
+        # A single reference assignment: requests holding the old lexicon are unaffected
+        _active_lexicon = lexicon
+        _bind_category_sets(lexicon)
+        _reload_stats['reloads'] += 1
+        _reload_stats['last_reload_ms'] = lexicon.compile_ms
+        _reload_stats['last_error'] = None
+        print(f"[Lexicon] ✅ Loaded version {lexicon.version} "
+              f"({len(lexicon.word_categories)} words) in {lexicon.compile_ms:.1f} ms")
+        return True
+
+def _watch_lexicon_file(interval):
+    path = _active_lexicon.source_path
+    last_mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    while True:
+        time.sleep(interval)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        if mtime != last_mtime:
+            last_mtime = mtime
+            reload_lexicon(path)
+
+_watcher_thread = None
+
+def start_lexicon_watcher(interval=LEXICON_POLL_SECONDS):
+    """Start the background thread that hot-reloads the lexicon file (idempotent)."""
+    global _watcher_thread
+    if _watcher_thread is None:
+        _watcher_thread = threading.Thread(target=_watch_lexicon_file, args=(interval,),
+                                           name='lexicon-watcher', daemon=True)
+        _watcher_thread.start()
+    return _watcher_thread
+
+def get_lexicon_info():
+    """Report the active lexicon version and reload statistics."""
+    lexicon = _active_lexicon
+    return {
+        'version': lexicon.version,
+        'path': lexicon.source_path,
+        'words': len(lexicon.word_categories),
+        'loaded_at': lexicon.loaded_at,
+        'reloads': _reload_stats['reloads'],
+        'last_reload_ms': round(_reload_stats['last_reload_ms'], 2),
+        'last_error': _reload_stats['last_error'],
+        'watching': _watcher_thread is not None
+    }
 
 # 🎯 QUANTUM WORD CATEGORIZER FUNCTION
-def get_quantum_category_for_word(word):
+def get_quantum_category_for_word(word, lexicon=None):
     """
     Determine which quantum transformation category a word belongs to.
     
     Args:
         word (str): Input word to categorize
+        lexicon (CompiledLexicon): Lexicon to use (defaults to the active one)
     
     Returns:
         str: Quantum transformation type ('scramble', 'reverse', 'ghost', 'quantum_caps', 
-             'quantum_gates', 'quantum_entanglement', 'quantum_memory', or 'original')
+             'quantum_gates', 'quantum_entanglement', 'quantum_interference',
+             'quantum_decoherence', or 'original')
     """
-    word_lower = word.lower().strip()
-    
-    # Check categories in priority order (most specific first)
-    if word_lower in QUANTUM_MEMORY_WORDS:
-        return 'quantum_interference'
-    elif word_lower in QUANTUM_GATES_WORDS:
-        return 'quantum_gates'
-    elif word_lower in QUANTUM_ENTANGLEMENT_WORDS:
-        return 'quantum_entanglement'
-    elif word_lower in GHOST_WORDS:
-        return 'ghost'
-    elif word_lower in QUANTUM_CAPS_WORDS:
-        return 'quantum_caps'
-    elif word_lower in SCRAMBLE_WORDS:
-        return 'scramble'
-    elif word_lower in REVERSE_WORDS:
-        return 'reverse'
-    else:
-        return 'original'  # No quantum transformation
+    return (lexicon or _active_lexicon).categorize(word)
 
 # 📊 STATISTICS AND COVERAGE FUNCTIONS
 def get_all_quantum_words():
     """Get all words that will receive quantum transformations."""
-    return (QUANTUM_MEMORY_WORDS | QUANTUM_GATES_WORDS | QUANTUM_ENTANGLEMENT_WORDS | 
-            GHOST_WORDS | QUANTUM_CAPS_WORDS | SCRAMBLE_WORDS | REVERSE_WORDS)
+    return frozenset(_active_lexicon.word_categories)
 
 def get_category_stats():
     """Get statistics about word distribution across categories."""
-    return {
-        'quantum_memory': len(QUANTUM_MEMORY_WORDS),
-        'quantum_gates': len(QUANTUM_GATES_WORDS), 
-        'quantum_entanglement': len(QUANTUM_ENTANGLEMENT_WORDS),
-        'ghost': len(GHOST_WORDS),
-        'quantum_caps': len(QUANTUM_CAPS_WORDS),
-        'scramble': len(SCRAMBLE_WORDS),
-        'reverse': len(REVERSE_WORDS),
-        'total_quantum_words': len(get_all_quantum_words())
-    }
+    lexicon = _active_lexicon
+    stats = {category: len(words) for category, words in lexicon.category_words.items()}
+    stats['total_quantum_words'] = len(lexicon.word_categories)
+    return stats
+
+def iter_categorized_words(text, lexicon=None):
+    """
+    Yield (word, category) for every word in text, using lexicon category names
+    ('quantum_memory', ..., 'reverse') and 'original' for uncategorized words.
+    """
+    lexicon = lexicon or _active_lexicon
+    for match in re.finditer(r'\b\w+\b', text.lower()):
+        word = match.group()
+        yield word, TRANSFORMATION_CATEGORIES.get(lexicon.categorize(word), 'original')
 
 def analyze_text_coverage(text):
     """
@@ -225,11 +274,9 @@ def analyze_text_coverage(text):
     Returns:
         dict: Coverage statistics and word categorization
     """
-    import re
-    words = re.findall(r'\b\w+\b', text.lower())
-    
     categorized_words = {
         'quantum_memory': [],
+        'quantum_decoherence': [],
         'quantum_gates': [],
         'quantum_entanglement': [],
         'ghost': [],
@@ -239,11 +286,11 @@ def analyze_text_coverage(text):
         'original': []
     }
     
-    for word in words:
-        category = get_quantum_category_for_word(word)
+    total_words = 0
+    for word, category in iter_categorized_words(text):
         categorized_words[category].append(word)
+        total_words += 1
     
-    total_words = len(words)
     quantum_words = total_words - len(categorized_words['original'])
     coverage_percent = (quantum_words / total_words * 100) if total_words > 0 else 0
     
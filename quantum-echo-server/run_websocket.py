@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Standalone launcher for the WebSocket channel.
+
+app.py only opens the WebSocket port under its own development server. Under
+gunicorn (or any WSGI server) run this next to it, so the channel starts no
+matter how the HTTP side is served:
+
+    gunicorn wsgi:app     # single worker, see gunicorn.conf.py
+    python run_websocket.py --cert cert.pem --key key.pem     # wss://
+    python run_websocket.py --adhoc                           # wss:// with a self-signed certificate
+    python run_websocket.py --insecure                        # ws://, e.g. behind a TLS-terminating proxy
+
+Without a certificate it refuses to start, so session traffic never goes out
+unencrypted by accident.
+"""
+
+import argparse
+import ssl
+import sys
+
+def build_ssl_context(cert=None, key=None, adhoc=False):
+    """
+    SSLContext from a certificate/key pair, or a self-signed one with adhoc=True.
+
+    Raises:
+        ValueError: If no certificate could be loaded or generated
+    """
+    if cert:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        try:
+            context.load_cert_chain(cert, key)
+        except (OSError, ssl.SSLError) as e:
+            raise ValueError(f'Could not load certificate {cert}: {e}')
+        return context
+    if adhoc:
+        try:
+            from werkzeug.serving import generate_adhoc_ssl_context
+            return generate_adhoc_ssl_context()
+        except (ImportError, TypeError) as e:
+            # werkzeug needs the cryptography package to generate certificates
+            raise ValueError(f'Could not generate a self-signed certificate: {e}')
+    raise ValueError('No certificate given')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the quantum echo WebSocket channel.')
+    parser.add_argument('--cert', default=None, help='TLS certificate (PEM)')
+    parser.add_argument('--key', default=None, help='TLS private key (PEM)')
+    parser.add_argument('--adhoc', action='store_true', help='Serve wss:// with a self-signed certificate')
+    parser.add_argument('--insecure', action='store_true', help='Serve plain ws:// without TLS')
+    args = parser.parse_args(argv)
+
+    ssl_context = None
+    if not args.insecure:
+        try:
+            ssl_context = build_ssl_context(args.cert, args.key, args.adhoc)
+        except ValueError as e:
+            print(f"[WebSocket] ❌ {e}. Pass --cert/--key, --adhoc, or --insecure for plain ws://")
+            return 1
+
+    import app as server
+    server.start_snapshots()
+    thread = server.start_websocket_channel(ssl_context)
+    if thread is None:
+        return 1
+    thread.join()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# session_store.py
+# 🧠 PER-SESSION QUANTUM REGISTERS
+#
+# Gives every player a small quantum register that persists between requests,
+# so gate choices made through /quantum_gate influence later /quantum_text calls.
+#
+# Registers are stored as compact complex64 amplitude arrays (2 ** num_qubits
+# values, 32 bytes for the default 2 qubits) rather than qiskit objects. The
+# store evicts sessions that have been idle longer than the TTL and, when full,
+# the least recently used session, so its size is bounded by a memory budget.
+
+from collections import OrderedDict
+import threading
+import time
+
+import numpy as np
+
+# Rough per-entry overhead of the session id, dict slot and bookkeeping tuple
+SESSION_OVERHEAD_BYTES = 256
+MAX_SESSION_ID_LENGTH = 64
+# Striped locks serializing read-modify-write updates of the same session
+UPDATE_LOCK_STRIPES = 64
+
+class SessionStore:
+    """Thread-safe LRU/TTL store of per-session register amplitudes."""
+
+    def __init__(self, num_qubits=2, max_sessions=10000, ttl_seconds=1800.0, max_bytes=8 * 1024 * 1024):
+        self.num_qubits = num_qubits
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.bytes_per_session = (2 ** num_qubits) * np.dtype(np.complex64).itemsize + SESSION_OVERHEAD_BYTES
+        # The memory budget caps the session count as well as the explicit limit
+        self.max_sessions = max(1, min(max_sessions, max_bytes // self.bytes_per_session))
+
+        self._sessions = OrderedDict()  # session id → (amplitudes, last access time)
+        self._lock = threading.Lock()
+        self._update_locks = [threading.Lock() for _ in range(UPDATE_LOCK_STRIPES)]
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def initial_state(self):
+        """Fresh register in |00...0>."""
+        amplitudes = np.zeros(2 ** self.num_qubits, dtype=np.complex64)
+        amplitudes[0] = 1
+        return amplitudes
+
+    def _expire(self, now):
+        # Entries are kept in access order, so expired ones are at the front
+        while self._sessions:
+            session_id, (_, last_access) = next(iter(self._sessions.items()))
+            if now - last_access <= self.ttl_seconds:
+                break
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def get(self, session_id):
+        """
+        Return a copy of the session's amplitudes, creating the session if needed.
+
+        Returns:
+            numpy.ndarray: complex128 amplitudes, normalized
+        """
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                amplitudes = self.initial_state()
+                self._insert(session_id, amplitudes, now)
+                self.created += 1
+            else:
+                amplitudes = entry[0]
+                self._sessions[session_id] = (amplitudes, now)
+                self._sessions.move_to_end(session_id)
+
+        # Undo complex64 rounding so probabilities sum to 1 for sampling
+        state = amplitudes.astype(np.complex128)
+        return state / np.linalg.norm(state)
+
+    def put(self, session_id, amplitudes):
+        """Store new amplitudes for a session (last write wins)."""
+        amplitudes = np.asarray(amplitudes, dtype=np.complex64)
+        if amplitudes.shape != (2 ** self.num_qubits,):
+            raise ValueError(f'Expected {2 ** self.num_qubits} amplitudes, got shape {amplitudes.shape}')
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            self._insert(session_id, amplitudes, now)
+
+    def update(self, session_id, fn):
+        """
+        Atomically read, transform and store a session's amplitudes. Concurrent
+        updates of the same session (e.g. pipelined WebSocket messages) run one
+        after the other instead of overwriting each other.
+
+        Args:
+            session_id (str): Session to update
+            fn (callable): amplitudes → (new amplitudes, result)
+
+        Returns:
+            The result returned by fn
+        """
+        with self._update_locks[hash(session_id) % UPDATE_LOCK_STRIPES]:
+            amplitudes, result = fn(self.get(session_id))
+            self.put(session_id, amplitudes)
+            return result
+
+    def _insert(self, session_id, amplitudes, now):
+        self._sessions[session_id] = (amplitudes, now)
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.time())
+            live = len(self._sessions)
+            return {
+                'live_sessions': live,
+                'max_sessions': self.max_sessions,
+                'num_qubits': self.num_qubits,
+                'ttl_seconds': self.ttl_seconds,
+                'estimated_bytes': live * self.bytes_per_session,
+                'max_bytes': self.max_bytes,
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
+
+def validate_session_id(session_id):
+    """
+    Check a client-supplied session id.
+
+    Raises:
+        ValueError: If the id is not a short non-empty string
+    """
+    if not isinstance(session_id, str) or not session_id.strip():
+        raise ValueError('session_id must be a non-empty string')
+    if len(session_id) > MAX_SESSION_ID_LENGTH:
+        raise ValueError(f'session_id must be at most {MAX_SESSION_ID_LENGTH} characters')
+    return session_id.strip()
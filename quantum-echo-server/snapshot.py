@@ -0,0 +1,188 @@
+# snapshot.py
+# 💾 WARM-START SNAPSHOTS OF SIMULATION CACHES
+#
+# Caches such as the Aer statevectors and the per-text transformation plans
+# start empty after every deploy or crash, so the first minutes of traffic pay
+# the full Qiskit cost. A SnapshotStore writes them to a versioned file
+# periodically and on graceful shutdown, and restores them at startup.
+#
+# File format: a numpy .npz archive (loaded with allow_pickle=False, so a
+# snapshot can never execute code) holding
+#   header   - JSON: format, qiskit / qiskit-aer versions, creation time
+#   document - JSON: whatever the collect callback returned besides arrays
+#   array/*  - the numpy arrays of the collect callback
+# A snapshot written by another qiskit or qiskit-aer version is ignored as a
+# whole; finer-grained invalidation (e.g. by lexicon version) is left to the
+# restore callback.
+
+import atexit
+import hashlib
+import json
+import os
+import signal
+import threading
+import time
+
+import numpy as np
+import qiskit
+import qiskit_aer
+
+SNAPSHOT_FORMAT = 1
+
+def runtime_versions():
+    """Versions a snapshot is only valid for."""
+    return {'format': SNAPSHOT_FORMAT, 'qiskit': qiskit.__version__, 'qiskit_aer': qiskit_aer.__version__}
+
+def _encode_json(value):
+    return np.frombuffer(json.dumps(value).encode('utf-8'), dtype=np.uint8)
+
+def _decode_json(array):
+    return json.loads(array.tobytes().decode('utf-8'))
+
+class SnapshotStore:
+    """Saves and restores caches through collect/restore callbacks."""
+
+    def __init__(self, path, collect, restore, interval=300.0):
+        self.path = path
+        self.collect = collect  # () → (document dict, {name: ndarray})
+        self.restore = restore  # (document, arrays) → {'restored': n, 'stale': n}
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._last_signature = None
+
+        self.loaded = False
+        self.restored_entries = 0
+        self.stale_entries = 0
+        self.last_load_ms = 0.0
+        self.saves = 0
+        self.skipped_unchanged = 0
+        self.last_save_ms = 0.0
+        self.last_saved_at = None
+        self.last_error = None
+
+    def load(self):
+        """
+        Restore caches from the snapshot file, if there is a valid one.
+
+        Returns:
+            bool: True if a snapshot was restored
+        """
+        if not self.path or not os.path.exists(self.path):
+            return False
+        started = time.perf_counter()
+        try:
+            with np.load(self.path, allow_pickle=False) as archive:
+                header = _decode_json(archive['header'])
+                if header.get('versions') != runtime_versions():
+                    print(f"[Snapshot] ♻️ Ignoring {self.path}: written by {header.get('versions')}")
+                    return False
+                document = _decode_json(archive['document'])
+                arrays = {name[len('array/'):]: archive[name] for name in archive.files if name.startswith('array/')}
+            result = self.restore(document, arrays)
+        except Exception as e:
+            # A truncated or corrupt file (BadZipFile, EOFError, ...) only means a cold start
+            self.last_error = f'load: {type(e).__name__}: {e}'
+            print(f"[Snapshot] ❌ Ignoring unreadable {self.path}: {type(e).__name__}: {e}")
+            return False
+
+        self.last_load_ms = (time.perf_counter() - started) * 1000
+        self.loaded = True
+        self.restored_entries = result.get('restored', 0)
+        self.stale_entries = result.get('stale', 0)
+        # Nothing new yet: an identical save would only rewrite the same file
+        self._last_signature = self._signature(*self.collect())
+        print(f"[Snapshot] ✅ Restored {self.restored_entries} entries "
+              f"({self.stale_entries} stale) in {self.last_load_ms:.1f} ms")
+        return True
+
+    def _signature(self, document, arrays):
+        digest = hashlib.sha256(json.dumps(document, sort_keys=True).encode('utf-8'))
+        for name in sorted(arrays):
+            digest.update(name.encode('utf-8'))
+        return digest.hexdigest()
+
+    def save(self):
+        """
+        Write the current caches to the snapshot file (atomically, via a temp file).
+        Skipped when nothing changed since the last load or save.
+
+        Returns:
+            bool: True if a snapshot was written
+        """
+        if not self.path:
+            return False
+        with self._lock:
+            started = time.perf_counter()
+            try:
+                document, arrays = self.collect()
+                signature = self._signature(document, arrays)
+                if signature == self._last_signature:
+                    self.skipped_unchanged += 1
+                    return False
+
+                header = {'versions': runtime_versions(), 'created_at': time.time()}
+                tmp_path = f'{self.path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    np.savez(f, header=_encode_json(header), document=_encode_json(document),
+                             **{f'array/{name}': array for name, array in arrays.items()})
+                    # On disk before the rename, so a crash never leaves a truncated snapshot
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except (OSError, ValueError, TypeError) as e:
+                self.last_error = f'save: {e}'
+                print(f"[Snapshot] ❌ Could not save {self.path}: {e}")
+                return False
+
+            self._last_signature = signature
+            self.saves += 1
+            self.last_save_ms = (time.perf_counter() - started) * 1000
+            self.last_saved_at = time.time()
+            return True
+
+    def _run_periodic(self):
+        while True:
+            time.sleep(self.interval)
+            self.save()
+
+    def start(self):
+        """
+        Start periodic saves and save on graceful shutdown (idempotent).
+        SIGTERM handlers installed by a process manager (e.g. gunicorn) still run afterwards.
+        """
+        if self._thread is not None or not self.path:
+            return self._thread
+        if self.interval > 0:
+            self._thread = threading.Thread(target=self._run_periodic, name='snapshot-writer', daemon=True)
+            self._thread.start()
+        atexit.register(self.save)
+
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is threading.main_thread():
+            previous = signal.getsignal(signal.SIGTERM)
+
+            def on_sigterm(signum, frame):
+                self.save()
+                if callable(previous):
+                    previous(signum, frame)
+                elif previous != signal.SIG_IGN:
+                    raise SystemExit(128 + signum)
+
+            signal.signal(signal.SIGTERM, on_sigterm)
+        return self._thread
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'loaded': self.loaded,
+            'restored_entries': self.restored_entries,
+            'stale_entries': self.stale_entries,
+            'last_load_ms': round(self.last_load_ms, 2),
+            'saves': self.saves,
+            'skipped_unchanged': self.skipped_unchanged,
+            'last_save_ms': round(self.last_save_ms, 2),
+            'last_saved_at': self.last_saved_at,
+            'interval_seconds': self.interval,
+            'last_error': self.last_error
+        }
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for admission control (admission.py) and the limits it enforces on the
+simulation endpoints.
+Runs offline: python -m pytest test_admission.py
+"""
+
+import threading
+import time
+
+import app as server
+from admission import AdmissionController, RateLimiter
+
+def test_token_bucket_allows_a_burst_then_limits():
+    limiter = RateLimiter(rate=1, burst=2)
+    assert limiter.check('player') == 0
+    assert limiter.check('player') == 0
+    assert 0 < limiter.check('player') <= 1
+    # Buckets are per client
+    assert limiter.check('other player') == 0
+    assert limiter.stats()['rate_limited'] == 1
+
+def test_zero_rate_disables_rate_limiting():
+    limiter = RateLimiter(rate=0, burst=1)
+    assert all(limiter.check('player') == 0 for _ in range(10))
+
+def test_full_queue_sheds_at_once():
+    controller = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=5)
+    assert controller.acquire()
+    started = time.monotonic()
+    assert not controller.acquire()
+    assert time.monotonic() - started < 1
+    assert controller.stats()['shed_queue_full'] == 1
+
+def test_queued_request_times_out():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.05)
+    assert controller.acquire()
+    assert not controller.acquire()
+    assert controller.stats()['shed_timeout'] == 1
+    assert controller.retry_after() == 1
+
+def test_queued_request_is_admitted_on_release():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+    assert controller.acquire()
+    admitted = []
+    waiter = threading.Thread(target=lambda: admitted.append(controller.acquire()))
+    waiter.start()
+    deadline = time.monotonic() + 2
+    while controller.stats()['waiting'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    controller.release()
+    waiter.join(2)
+    assert admitted == [True]
+    assert controller.stats()['queued'] == 1
+
+def test_try_acquire_yields_to_waiting_requests_even_with_a_free_slot():
+    controller = AdmissionController(max_in_flight=2, max_queue=1, queue_timeout=5)
+    # A live request has been woken but not yet taken the freed slot
+    controller.waiting = 1
+    assert not controller.try_acquire()
+    controller.waiting = 0
+    assert controller.try_acquire()
+    controller.release()
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+def test_too_many_characters_is_413(client):
+    response = client.post('/quantum_text', json={'text': 'a' * (server.MAX_TEXT_CHARS + 1)})
+    assert response.status_code == 413
+
+def test_too_many_words_is_413(client, monkeypatch):
+    monkeypatch.setattr(server, 'MAX_TEXT_WORDS', 3)
+    response = client.post('/quantum_text', json={'text': 'one two three four'})
+    assert response.status_code == 413
+
+def test_rate_limited_client_gets_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(server, 'rate_limiter', RateLimiter(rate=0.5, burst=1))
+    assert client.post('/quantum_gate', json={'gate_type': 'bit_flip'}).status_code == 200
+    response = client.post('/quantum_gate', json={'gate_type': 'bit_flip'})
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '2'
+
+def test_full_queue_gets_503_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(server, 'admission', AdmissionController(max_in_flight=0, max_queue=0, queue_timeout=3))
+    response = client.post('/quantum_gate', json={'gate_type': 'bit_flip'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+
+def test_queue_timeout_gets_503_with_retry_after(client, monkeypatch):
+    controller = AdmissionController(max_in_flight=0, max_queue=1, queue_timeout=0.05)
+    monkeypatch.setattr(server, 'admission', controller)
+    response = client.post('/quantum_text', json={'text': 'hello'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert controller.stats()['shed_timeout'] == 1
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the corpus coverage audit (coverage_audit.py).
+Runs offline: python -m pytest test_coverage_audit.py
+"""
+
+import json
+
+import pytest
+
+import coverage_audit
+from quantum_word_dictionary import analyze_text_coverage
+
+STORY = """That was three days ago and you, Theo and Ava have been locked away behind
+heavy security doors in the secure lab. The quantumquantum echo flickers: static,
+memories, entanglement and ghostly light return.
+"""
+
+@pytest.fixture
+def story_file(tmp_path):
+    path = tmp_path / 'story.txt'
+    path.write_text(STORY, encoding='utf-8')
+    return str(path)
+
+def test_chunks_never_split_a_word(story_file):
+    chunks = list(coverage_audit.iter_text_chunks([story_file], chunk_chars=8))
+    assert ''.join(chunks) == STORY
+    assert 'quantumquantum ' in chunks
+
+def test_overlong_words_are_split_at_the_bound(tmp_path, monkeypatch):
+    monkeypatch.setattr(coverage_audit, 'MAX_WORD_CHARS', 10)
+    path = tmp_path / 'word.txt'
+    path.write_text('a' * 25 + ' b', encoding='utf-8')
+    chunks = list(coverage_audit.iter_text_chunks([str(path)], chunk_chars=4))
+    assert ''.join(chunks) == 'a' * 25 + ' b'
+    assert max(len(chunk) for chunk in chunks) <= 10 + 4
+
+@pytest.mark.parametrize('chunk_chars', [1, 7, 8, 13, 64, coverage_audit.DEFAULT_CHUNK_CHARS])
+def test_chunked_counts_match_whole_text(story_file, chunk_chars):
+    expected = analyze_text_coverage(STORY)
+    report = coverage_audit.audit_corpus([story_file], workers=1, chunk_chars=chunk_chars).report()
+    assert report['total_words'] == expected['total_words']
+    assert report['quantum_words'] == expected['quantum_words']
+    assert report['category_counts'] == expected['category_counts']
+
+def test_cli_json_report(story_file, capsys):
+    assert coverage_audit.main([story_file, '--workers', '1', '--chunk-chars', '7', '--json']) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report['total_words'] == analyze_text_coverage(STORY)['total_words']
+
+def test_worker_pool_counts_match_whole_text(story_file):
+    report = coverage_audit.audit_corpus([story_file], workers=2, chunk_chars=13).report()
+    assert report['category_counts'] == analyze_text_coverage(STORY)['category_counts']
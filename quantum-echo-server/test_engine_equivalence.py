@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Statistical equivalence tests between fast engines and the Qiskit reference path.
+
+Every faster replacement for Qubit, QuantumCircuitManager.simulate or the text
+transforms has to preserve what players see: measurement probabilities,
+superposition strengths and glyph frequencies. Candidates are registered in the
+*_ENGINES dicts below, including the live app.py functions, and run side by side
+with a reference that never changes along with them: qiskit circuits built in
+this file, and the frozen copy of the original engines in engine_reference.py.
+
+- deterministic quantities (amplitudes, superposition strengths, channel tables)
+  must agree within AMPLITUDE_TOLERANCE
+- sampled outcomes are compared with chi-square tests at significance ALPHA
+
+scipy comes from requirements-dev.txt. All seeds are fixed, so a run is
+reproducible and needs no network:
+    python -m pytest test_engine_equivalence.py
+    QUANTUM_EQUIVALENCE_SAMPLES=5000 python -m pytest test_engine_equivalence.py
+"""
+
+from collections import Counter
+import math
+import os
+import random
+
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+from qiskit_aer import AerSimulator
+from scipy import stats
+
+import app as server
+import engine_reference
+import noise_channels
+
+SAMPLES = int(os.environ.get('QUANTUM_EQUIVALENCE_SAMPLES', 500))
+ALPHA = 1e-3
+AMPLITUDE_TOLERANCE = 1e-6
+MIN_EXPECTED = 5  # chi-square cells expecting fewer samples are pooled
+
+# Candidate engines, each compared against the Qiskit reference below.
+# A faster engine is added here and has to pass the same tests before it ships.
+
+# class with the Qubit interface
+QUBIT_ENGINES = {'qiskit_statevector': server.Qubit}
+
+# (num_qubits, category) → statevector of build_advanced_circuit
+STATEVECTOR_ENGINES = {
+    'aer_cached': server.get_advanced_statevector,
+    'analytic': server.get_analytic_statevector
+}
+
+# (word, category, initial_state) → transformed word, for the basic categories
+def _render_basic_plan(word, category, initial_state=None):
+    plan = server.TransformationPlan([(word, 'basic', category, None)], 1, 1)
+    return server.render_transformation_plan(plan, initial_state)[0]
+
+BASIC_TEXT_ENGINES = {
+    'qiskit_qubits': server.apply_basic_transformation,
+    'plan_render': _render_basic_plan
+}
+
+# (word, category) → transformed word, for the advanced categories
+def _render_advanced_plan(word, category):
+    statevector = server.get_advanced_statevector(min(len(word), server.MAX_ADVANCED_QUBITS), category)
+    plan = server.TransformationPlan([(word, 'advanced', category, statevector)], 1, 1)
+    return server.render_transformation_plan(plan)[0]
+
+ADVANCED_TEXT_ENGINES = {
+    'aer_cached': server.apply_advanced_transformation,
+    'plan_render': _render_advanced_plan
+}
+
+# (parsed gates, num_qubits, shots, initial_state, seed) → (state, steps, counts)
+SEQUENCE_ENGINES = {'register_statevector': server.simulate_gate_sequence}
+
+# (text, channel, intensity, rng) → (text, coherence)
+NOISE_ENGINES = {'cached_tables': noise_channels.apply_noise_transformation}
+
+SINGLE_QUBIT_GATES = [
+    ('bit_flip', lambda q: q.bit_flip(), lambda qc: qc.x(0)),
+    ('phase_flip', lambda q: q.phase_flip(), lambda qc: qc.z(0)),
+    ('hadamard', lambda q: q.hadamard(), lambda qc: qc.h(0)),
+    ('rotate_y', lambda q: q.rotate_y(math.pi / 3), lambda qc: qc.ry(math.pi / 3, 0)),
+]
+
+# |0>, |1>, |+> and a session-conditioned state
+INITIAL_STATES = [None, [0, 1], [1 / math.sqrt(2), 1 / math.sqrt(2)], [math.cos(0.4), math.sin(0.4)]]
+
+# ---------------------------------------------------------------------------
+# Statistics helpers
+# ---------------------------------------------------------------------------
+
+def _pooled(counts_list, expected=None):
+    """Pool outcomes too rare for a chi-square cell into one 'rare' outcome."""
+    outcomes = sorted(set().union(*counts_list) | set(expected or {}))
+    total = sum(sum(counts.values()) for counts in counts_list)
+    if expected is not None:
+        common = [o for o in outcomes if expected.get(o, 0) * total >= MIN_EXPECTED]
+    else:
+        common = [o for o in outcomes if sum(c.get(o, 0) for c in counts_list) >= 2 * MIN_EXPECTED]
+    rare = [o for o in outcomes if o not in common]
+    return common, rare
+
+def assert_same_distribution(reference, candidate, label):
+    """Two-sample chi-square test of two outcome Counters."""
+    common, rare = _pooled([reference, candidate])
+    table = [[counts.get(o, 0) for o in common] + [sum(counts.get(o, 0) for o in rare)]
+             for counts in (reference, candidate)]
+    table = np.array(table)
+    table = table[:, table.sum(axis=0) > 0]
+    if table.shape[1] < 2:
+        assert set(reference) == set(candidate), f'{label}: outcomes differ {reference} vs {candidate}'
+        return
+    p_value = stats.chi2_contingency(table).pvalue
+    assert p_value > ALPHA, f'{label}: p={p_value:.2e}\n  reference {dict(reference)}\n  candidate {dict(candidate)}'
+
+def assert_matches_probabilities(counts, probabilities, label):
+    """Goodness-of-fit chi-square test of sampled outcomes against exact probabilities."""
+    total = sum(counts.values())
+    impossible = {o: n for o, n in counts.items() if probabilities.get(o, 0) < AMPLITUDE_TOLERANCE}
+    assert not impossible, f'{label}: sampled impossible outcomes {impossible}'
+
+    common, rare = _pooled([counts], probabilities)
+    observed = [counts.get(o, 0) for o in common]
+    expected = [probabilities[o] * total for o in common]
+    rare_probability = sum(probabilities.get(o, 0) for o in rare)
+    if rare_probability * total >= MIN_EXPECTED:
+        observed.append(sum(counts.get(o, 0) for o in rare))
+        expected.append(rare_probability * total)
+    if len(observed) < 2:
+        return
+    # Rescale so both sides sum exactly (pooling may drop a negligible tail)
+    expected = np.array(expected) * sum(observed) / sum(expected)
+    p_value = stats.chisquare(observed, expected).pvalue
+    assert p_value > ALPHA, f'{label}: p={p_value:.2e}\n  observed {dict(counts)}\n  expected {probabilities}'
+
+def assert_same_amplitudes(reference, candidate, label):
+    assert np.allclose(np.asarray(candidate), np.asarray(reference), atol=AMPLITUDE_TOLERANCE), \
+        f'{label}:\n  reference {np.asarray(reference)}\n  candidate {np.asarray(candidate)}'
+
+def _reference_state(initial_state, apply_circuit):
+    qc = QuantumCircuit(1)
+    apply_circuit(qc)
+    return Statevector(initial_state if initial_state is not None else [1, 0]).evolve(qc)
+
+# ---------------------------------------------------------------------------
+# Qubit
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('engine', QUBIT_ENGINES)
+@pytest.mark.parametrize('initial_state', INITIAL_STATES)
+@pytest.mark.parametrize('gate,apply_qubit,apply_circuit', SINGLE_QUBIT_GATES, ids=[g[0] for g in SINGLE_QUBIT_GATES])
+def test_qubit_amplitudes_and_superposition(engine, initial_state, gate, apply_qubit, apply_circuit):
+    reference = _reference_state(initial_state, apply_circuit)
+    qubit = QUBIT_ENGINES[engine](initial_state)
+    apply_qubit(qubit)
+
+    assert_same_amplitudes(reference.data, qubit.state.data, f'{engine} {gate}')
+    alpha, beta = reference.data
+    assert qubit.get_superposition_strength() == pytest.approx(2 * abs(alpha * beta), abs=AMPLITUDE_TOLERANCE)
+
+@pytest.mark.parametrize('engine', QUBIT_ENGINES)
+@pytest.mark.parametrize('initial_state', INITIAL_STATES)
+@pytest.mark.parametrize('gate,apply_qubit,apply_circuit', SINGLE_QUBIT_GATES, ids=[g[0] for g in SINGLE_QUBIT_GATES])
+def test_qubit_measurement_frequencies(engine, initial_state, gate, apply_qubit, apply_circuit):
+    probabilities = _reference_state(initial_state, apply_circuit).probabilities_dict()
+
+    random.seed(1000)
+    counts = Counter()
+    for _ in range(SAMPLES):
+        qubit = QUBIT_ENGINES[engine](initial_state)
+        apply_qubit(qubit)
+        counts[str(qubit.measure())] += 1
+    assert_matches_probabilities(counts, probabilities, f'{engine} {gate} from {initial_state}')
+
+# ---------------------------------------------------------------------------
+# Advanced circuits (QuantumCircuitManager.simulate)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('engine', STATEVECTOR_ENGINES)
+@pytest.mark.parametrize('category', server.ADVANCED_CATEGORIES)
+def test_advanced_statevectors_match_aer(engine, category):
+    for num_qubits in range(2, server.MAX_ADVANCED_QUBITS + 1):
+        reference = engine_reference.advanced_statevector(num_qubits, category)
+        candidate = STATEVECTOR_ENGINES[engine](num_qubits, category)
+        assert_same_amplitudes(reference.data, candidate.data, f'{engine} {category} ({num_qubits} qubits)')
+
+# ---------------------------------------------------------------------------
+# Basic text transforms
+# ---------------------------------------------------------------------------
+
+def _glyph_counts(transform, word, category, seed, initial_state=None):
+    """Per-position counts of output glyphs over SAMPLES transforms of word."""
+    random.seed(seed)
+    counts = [Counter() for _ in word]
+    for _ in range(SAMPLES):
+        output = transform(word, category, initial_state)
+        glyphs = _split_glyphs(output)
+        assert len(glyphs) == len(word), f'{category}: {word!r} → {output!r}'
+        for position, glyph in enumerate(glyphs):
+            counts[position][glyph] += 1
+    return counts
+
+def _split_glyphs(text):
+    """Split per-character output; bracket glyphs like ⟨ᵃ⟩ span three code points."""
+    glyphs = []
+    i = 0
+    while i < len(text):
+        if text[i] == '⟨':
+            end = text.index('⟩', i)
+            glyphs.append(text[i:end + 1])
+            i = end + 1
+        else:
+            glyphs.append(text[i])
+            i += 1
+    return glyphs
+
+@pytest.mark.parametrize('engine', BASIC_TEXT_ENGINES)
+@pytest.mark.parametrize('category', server.BASIC_CATEGORIES)
+def test_basic_glyph_frequencies(engine, category):
+    # Upper case, a vowel with both bracket and diacritic forms, and a consonant without either
+    word = 'Sab'
+    reference = _glyph_counts(engine_reference.apply_basic_transformation, word, category, seed=2000)
+    candidate = _glyph_counts(BASIC_TEXT_ENGINES[engine], word, category, seed=3000)
+    for position, char in enumerate(word):
+        assert_same_distribution(reference[position], candidate[position], f'{engine} {category} {char!r}')
+
+@pytest.mark.parametrize('engine', BASIC_TEXT_ENGINES)
+def test_basic_glyph_frequencies_from_session_state(engine):
+    # Session-conditioned transforms start every qubit in the player's state
+    initial_state = [math.cos(0.4), math.sin(0.4)]
+    word = 'Ea'
+    reference = _glyph_counts(engine_reference.apply_basic_transformation, word, 'ghost', 4000, initial_state)
+    candidate = _glyph_counts(BASIC_TEXT_ENGINES[engine], word, 'ghost', 5000, initial_state)
+    for position, char in enumerate(word):
+        assert_same_distribution(reference[position], candidate[position], f'{engine} session {char!r}')
+
+# ---------------------------------------------------------------------------
+# Advanced text transforms
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('engine', ADVANCED_TEXT_ENGINES)
+@pytest.mark.parametrize('category', server.ADVANCED_CATEGORIES)
+def test_advanced_text_matches_reference(engine, category):
+    # Statevector transforms are deterministic up to the random fallback, so outputs must be identical
+    for word in ['Qu', 'entangled', 'Superpositions', 'aeiouAEIOUnsNS']:
+        random.seed(5500)
+        expected = engine_reference.apply_advanced_transformation(word, category)
+        random.seed(5500)
+        assert ADVANCED_TEXT_ENGINES[engine](word, category) == expected, f'{engine} {category} {word!r}'
+
+# ---------------------------------------------------------------------------
+# Gate sequences
+# ---------------------------------------------------------------------------
+
+# (num_qubits, /quantum_gate sequence, the same circuit as qiskit instructions)
+SEQUENCES = [
+    (1, [{'gate': 'hadamard'}], [('h', 0)]),
+    (1, [{'gate': 'rotation', 'angle': 1.1}, {'gate': 'z'}, {'gate': 'h'}],
+     [('ry', 1.1, 0), ('z', 0), ('h', 0)]),
+    (2, [{'gate': 'h', 'target': 0}, {'gate': 'cnot', 'control': 0, 'target': 1}],
+     [('h', 0), ('cx', 0, 1)]),
+    (3, [{'gate': 'ry', 'target': 0, 'angle': 0.7}, {'gate': 'h', 'target': 2},
+         {'gate': 'cx', 'control': 0, 'target': 1}, {'gate': 'swap', 'control': 1, 'target': 2},
+         {'gate': 'cz', 'control': 2, 'target': 0}, {'gate': 'h', 'target': 0}],
+     [('ry', 0.7, 0), ('h', 2), ('cx', 0, 1), ('swap', 1, 2), ('cz', 2, 0), ('h', 0)]),
+]
+
+def _aer_reference(instructions, num_qubits, shots, seed):
+    qc = QuantumCircuit(num_qubits)
+    for name, *args in instructions:
+        getattr(qc, name)(*args)
+    qc.save_statevector()
+    qc.measure_all()
+    result = AerSimulator(method='statevector', seed_simulator=seed).run(qc, shots=shots).result()
+    return result.get_statevector(), Counter(result.get_counts())
+
+@pytest.mark.parametrize('engine', SEQUENCE_ENGINES)
+@pytest.mark.parametrize('num_qubits,gates,instructions', SEQUENCES)
+def test_gate_sequence_matches_aer(engine, num_qubits, gates, instructions):
+    parsed = server.parse_gate_sequence(gates, num_qubits)
+    reference_state, reference_counts = _aer_reference(instructions, num_qubits, SAMPLES, seed=6000)
+    state, steps, counts = SEQUENCE_ENGINES[engine](parsed, num_qubits, SAMPLES, seed=7000)
+
+    assert_same_amplitudes(reference_state.data, state.data, f'{engine} {gates}')
+    for q in range(num_qubits):
+        p0, p1 = reference_state.probabilities([q])
+        assert steps[-1]['superposition_strength'][q] == pytest.approx(2 * math.sqrt(p0 * p1), abs=1e-3)
+    assert_same_distribution(reference_counts, Counter(counts), f'{engine} {gates}')
+
+@pytest.mark.parametrize('engine', SEQUENCE_ENGINES)
+@pytest.mark.parametrize('gate,apply_qubit,apply_circuit', SINGLE_QUBIT_GATES, ids=[g[0] for g in SINGLE_QUBIT_GATES])
+def test_single_gate_sequence_matches_qubit(engine, gate, apply_qubit, apply_circuit):
+    # A one-gate sequence on one qubit has to behave like the single-gate Qubit path
+    name = {'rotate_y': 'rotation'}.get(gate, gate)
+    parsed = server.parse_gate_sequence([{'gate': name, 'angle': math.pi / 3}], 1)
+    state, steps, counts = SEQUENCE_ENGINES[engine](parsed, 1, SAMPLES, seed=8000)
+
+    qubit = engine_reference.Qubit()
+    apply_qubit(qubit)
+    assert_same_amplitudes(qubit.state.data, state.data, f'{engine} {gate}')
+    assert steps[0]['superposition_strength'][0] == pytest.approx(qubit.get_superposition_strength(), abs=1e-3)
+    assert_matches_probabilities(Counter(counts), qubit.state.probabilities_dict(), f'{engine} {gate}')
+
+# ---------------------------------------------------------------------------
+# Noise channels
+# ---------------------------------------------------------------------------
+
+def _aer_noisy_density_matrix(channel, strength, label):
+    qc = QuantumCircuit(1)
+    if label == '1':
+        qc.x(0)
+    elif label == '+':
+        qc.h(0)
+    qc.append(noise_channels.NOISE_CHANNELS[channel](float(strength)), [0])
+    qc.save_density_matrix()
+    return AerSimulator(method='density_matrix').run(qc).result().data()['density_matrix']
+
+@pytest.mark.parametrize('channel', noise_channels.NOISE_CHANNELS)
+def test_noise_tables_match_aer_density_matrix(channel):
+    table = noise_channels.NOISE_TABLES[channel]
+    for level, strength in enumerate(table.strengths):
+        for bit in (0, 1):
+            rho = _aer_noisy_density_matrix(channel, strength, str(bit))
+            assert table.flip[level, bit] == pytest.approx(rho.probabilities()[1 - bit], abs=AMPLITUDE_TOLERANCE)
+        rho = _aer_noisy_density_matrix(channel, strength, '+')
+        assert table.coherence[level] == pytest.approx(2 * abs(rho.data[0, 1]), abs=AMPLITUDE_TOLERANCE)
+
+@pytest.mark.parametrize('engine', NOISE_ENGINES)
+@pytest.mark.parametrize('channel', noise_channels.NOISE_CHANNELS)
+@pytest.mark.parametrize('intensity', [0.3, 0.7])
+def test_noise_glyph_frequencies(engine, channel, intensity):
+    table = noise_channels.NOISE_TABLES[channel]
+    level = table.level_for(intensity)
+    decohere = 1 - table.coherence[level]
+
+    rng = np.random.default_rng(9000)
+    for char, bit in (('a', 0), ('A', 1)):
+        flip = table.flip[level, bit]
+        probabilities = {
+            noise_channels.FRAGMENT_GLYPH: flip * decohere,
+            char.swapcase(): flip * (1 - decohere),
+            noise_channels.FADED_CHARS[char]: (1 - flip) * decohere,
+            char: (1 - flip) * (1 - decohere)
+        }
+        text, coherence = NOISE_ENGINES[engine](char * SAMPLES, channel, intensity, rng)
+        assert coherence == pytest.approx(table.coherence[level], abs=AMPLITUDE_TOLERANCE)
+        assert_matches_probabilities(Counter(text), probabilities, f'{engine} {channel} {char!r}')
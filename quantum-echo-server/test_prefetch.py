@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for the speculative prefetch queue (prefetch.py).
+Runs offline: python -m pytest test_prefetch.py
+"""
+
+import threading
+import time
+
+from prefetch import Prefetcher
+
+def make_prefetcher(slot, done, max_queue=5):
+    return Prefetcher(work=lambda text, context: done.append(text) or text, key_fn=lambda text, context: text,
+                      try_acquire=slot.is_set, release=lambda: None, max_queue=max_queue)
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_resubmitting_a_group_frees_its_queue_space():
+    prefetcher = make_prefetcher(threading.Event(), [])
+    for attempt in range(4):
+        assert prefetcher.submit('player', [(0, f'branch {attempt}.{i}') for i in range(5)]) == 5
+    stats = prefetcher.stats()
+    assert stats['queued'] == 5
+    assert stats['dropped_queue_full'] == 0
+    assert stats['cancelled'] == 15
+
+def test_branch_cancelled_while_waiting_for_a_slot_is_not_computed():
+    slot = threading.Event()
+    done = []
+    prefetcher = make_prefetcher(slot, done)
+    prefetcher.submit('player', [(0, 'old branch')])
+    prefetcher.start()
+    # The worker has taken the item and now waits for a simulation slot
+    assert wait_for(lambda: prefetcher.stats()['queued'] == 0)
+
+    prefetcher.submit('player', [(0, 'new branch')])
+    slot.set()
+    assert wait_for(lambda: prefetcher.stats()['completed'] == 1)
+    assert done == ['new branch']
+    assert prefetcher.take('new branch') == 'new branch'
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the /quantum_gate endpoint (single gates and gate sequences) and
+request body validation.
+Runs offline against the Flask test client: python -m pytest test_quantum_gate.py
+"""
+
+import math
+import threading
+
+import pytest
+
+import app as server
+
+def test_single_bit_flip_measures_one(client):
+    response = client.post('/quantum_gate', json={'gate_type': 'bit_flip'})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['measurement'] == 1
+    assert data['superposition_strength'] == 0
+    assert data['success'] is False
+
+def test_single_gate_rejects_unknown_gate(client):
+    response = client.post('/quantum_gate', json={'gate_type': 'teleport'})
+    assert response.status_code == 400
+
+def test_bell_sequence_histogram(client):
+    response = client.post('/quantum_gate', json={
+        'num_qubits': 2,
+        'shots': 400,
+        'seed': 7,
+        'gates': [
+            {'gate': 'hadamard', 'target': 0},
+            {'gate': 'cnot', 'control': 0, 'target': 1}
+        ]
+    })
+    assert response.status_code == 200
+    data = response.get_json()
+
+    assert [step['gate'] for step in data['steps']] == ['hadamard', 'cnot']
+    assert data['steps'][0]['superposition_strength'] == [1.0, 0.0]
+    assert data['final_superposition_strength'] == [1.0, 1.0]
+
+    # A Bell state only ever measures 00 or 11
+    assert set(data['counts']) <= {'00', '11'}
+    assert sum(data['counts'].values()) == 400
+    assert 120 < data['counts'].get('00', 0) < 280
+
+def test_sequence_rotation_angle(client):
+    response = client.post('/quantum_gate', json={
+        'shots': 1,
+        'gates': [{'gate': 'rotation', 'target': 0, 'angle': math.pi / 2}]
+    })
+    assert response.status_code == 200
+    assert response.get_json()['final_superposition_strength'] == [1.0]
+
+@pytest.mark.parametrize('payload', [
+    {'gates': []},
+    {'gates': [{'gate': 'hadamard', 'target': 3}], 'num_qubits': 2},
+    {'gates': [{'gate': 'cnot', 'control': 0, 'target': 0}], 'num_qubits': 2},
+    {'gates': [{'gate': 'cnot', 'target': 1}], 'num_qubits': 2},
+    {'gates': [{'gate': 'hadamard'}], 'num_qubits': 99},
+    {'gates': [{'gate': 'hadamard'}], 'shots': 0},
+])
+def test_sequence_rejects_invalid_requests(client, payload):
+    assert client.post('/quantum_gate', json=payload).status_code == 400
+
+def test_session_sequence_persists_register(client):
+    session = {'session_id': 'test-gate-sequence'}
+    client.post('/quantum_gate', json={**session, 'gates': [{'gate': 'x', 'target': 0}]})
+    data = client.post('/quantum_gate', json={**session, 'gates': [{'gate': 'cnot', 'control': 0, 'target': 1}],
+                                              'shots': 10}).get_json()
+
+    # |01> from the first request, then CNOT → |11>
+    assert data['counts'] == {'11': 10}
+    assert data['register_probabilities'] == [0.0, 0.0, 0.0, 1.0]
+    server.session_store.delete(session['session_id'])
+
+@pytest.mark.parametrize('endpoint', ['/quantum_gate', '/quantum_text', '/prefetch', '/prefetch/cancel'])
+@pytest.mark.parametrize('body', ['[1]', '[1, 2]', '"text"', '{not json'])
+def test_non_object_bodies_are_rejected(client, endpoint, body):
+    response = client.post(endpoint, data=body, content_type='application/json')
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('body', [
+    '{"gates": [{"gate": "ry", "angle": Infinity}]}',
+    '{"gates": [{"gate": "ry", "angle": NaN}]}',
+    '{"gate_type": "rotation", "rotation_angle": -Infinity}',
+    '{"num_qubits": true, "gates": [{"gate": "h"}]}',
+    '{"shots": true, "gates": [{"gate": "h"}]}',
+    '{"seed": false, "gates": [{"gate": "h"}]}',
+])
+def test_non_finite_and_boolean_numbers_are_rejected(client, body):
+    response = client.post('/quantum_gate', data=body, content_type='application/json')
+    assert response.status_code == 400
+
+def test_prefetch_cancel_without_a_body_uses_the_client_group(client):
+    response = client.post('/prefetch/cancel')
+    assert response.status_code == 200
+    assert response.get_json()['cancelled'] is True
+
+def test_concurrent_session_updates_are_not_lost(client):
+    # 40 rotations of pi/40 applied from parallel requests add up to pi: |00> → |10>
+    session = {'session_id': 'test-concurrent-updates'}
+    payload = {**session, 'gates': [{'gate': 'ry', 'target': 1, 'angle': math.pi / 40}]}
+    threads = [threading.Thread(target=server.quantum_gate_sequence, args=(payload,)) for _ in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    probabilities = abs(server.session_store.get(session['session_id'])) ** 2
+    assert probabilities[2] == pytest.approx(1.0, abs=1e-3)
+    server.session_store.delete(session['session_id'])
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the /quantum_text endpoint.
+Runs offline against the Flask test client: python -m pytest test_quantum_text.py
+"""
+
+import time
+
+import numpy as np
+
+import app as server
+import engine_reference
+import noise_channels
+
+def noise_glyphs(char):
+    return {char, char.swapcase(), noise_channels.FADED_CHARS.get(char, char), noise_channels.FRAGMENT_GLYPH}
+
+def test_decoherence_words_use_the_noise_engine(client):
+    text = 'static glitch'
+    outputs = set()
+    for _ in range(20):
+        response = client.post('/quantum_text', json={'text': text})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['quantum_words'] == 2
+        assert data['coverage_percent'] == 100.0
+
+        transformed = data['transformed']
+        assert len(transformed) == len(text)
+        for original, char in zip(text, transformed):
+            assert char in noise_glyphs(original)
+        outputs.add(transformed)
+
+    plan, _ = server.get_transformation_plan(text)
+    assert [engine for _, engine, _, _ in plan.tokens] == ['noise', 'passthrough', 'noise']
+    # Amplitude damping at the default intensity changes letters most of the time
+    assert len(outputs) > 1
+
+def wait_for_prefetch(key, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with server.prefetcher._condition:
+            if key in server.prefetcher._results:
+                return True
+        time.sleep(0.01)
+    return False
+
+def test_session_prefetch_is_served_to_the_same_session(client):
+    session = {'session_id': 'test-prefetch-session'}
+    text = 'Memories of light return.'
+    client.post('/quantum_gate', json={**session, 'gates': [{'gate': 'ry', 'angle': 0.8}]})
+    response = client.post('/prefetch', json={**session, 'texts': [text]})
+    assert response.status_code == 200
+    assert wait_for_prefetch(server.prefetch_key(text, server.get_session_qubit_state(session['session_id'])))
+
+    # Rendered from another qubit state, so not served without the session
+    assert client.post('/quantum_text', json={'text': text}).get_json()['prefetched'] is False
+    assert client.post('/quantum_text', json={**session, 'text': text}).get_json()['prefetched'] is True
+    server.session_store.delete(session['session_id'])
+
+def test_session_prefetch_is_not_served_after_the_state_changed(client):
+    session = {'session_id': 'test-prefetch-stale'}
+    text = 'The console flickers.'
+    client.post('/prefetch', json={**session, 'texts': [text]})
+    assert wait_for_prefetch(server.prefetch_key(text, server.get_session_qubit_state(session['session_id'])))
+
+    client.post('/quantum_gate', json={**session, 'gates': [{'gate': 'ry', 'angle': 0.8}]})
+    assert client.post('/quantum_text', json={**session, 'text': text}).get_json()['prefetched'] is False
+    server.session_store.delete(session['session_id'])
+
+def test_repeated_text_reuses_its_plan_with_fresh_randomness(client):
+    # 'alarm' and 'amazed' are scramble words: Hadamard qubits, so the rendering varies
+    text = 'Alarm and amazed analysis of plancachetest.'
+
+    first = client.post('/quantum_text', json={'text': text}).get_json()
+    assert first['plan_cached'] is False
+    outputs = {first['transformed']}
+    for _ in range(20):
+        data = client.post('/quantum_text', json={'text': text}).get_json()
+        assert data['plan_cached'] is True
+        assert (data['quantum_words'], data['total_words']) == (first['quantum_words'], first['total_words'])
+        outputs.add(data['transformed'])
+    assert len(outputs) > 1
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache = server.BoundedCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert [key for key, _ in cache.items()] == ['a', 'c']
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['entries'] == 2
+
+def test_plan_cache_size_zero_disables_caching():
+    cache = server.BoundedCache(0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+    assert cache.stats()['entries'] == 0
+
+def test_zero_latency_budget_leaves_every_quantum_word_original(client):
+    text = 'Alarm, entangled analysis!'
+    response = client.post('/quantum_text', json={'text': text}, headers={'X-Latency-Budget-Ms': '0'})
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['transformed'] == text
+    assert data['quantum_words'] == data['total_words'] == 3
+    assert data['degraded_words'] == data['total_words']
+
+def test_degraded_statevector_is_exact_and_cached(client, monkeypatch):
+    # An Aer run that would never fit the budget forces the analytic evaluation
+    monkeypatch.setattr(server, '_advanced_statevectors', {})
+    monkeypatch.setattr(server, 'aer_simulation_ms', 1e6)
+
+    def no_aer(self):
+        raise AssertionError('Aer should not run when the budget is short')
+    monkeypatch.setattr(server.QuantumCircuitManager, 'simulate', no_aer)
+
+    text = 'Entangled degradetest'
+    response = client.post('/quantum_text', json={'text': text, 'latency_budget_ms': 5000})
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['degraded_words'] == 0
+
+    key = (min(len('Entangled'), server.MAX_ADVANCED_QUBITS), 'quantum_entanglement')
+    assert key in server._advanced_statevectors
+    reference = engine_reference.advanced_statevector(*key)
+    assert np.allclose(server._advanced_statevectors[key].data, reference.data, atol=1e-9)
+
+    plan, cached = server.get_transformation_plan(text)
+    assert cached
+    assert plan.tokens[0][3] is server._advanced_statevectors[key]
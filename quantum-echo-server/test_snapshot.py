@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for warm-start snapshots (snapshot.py).
+Runs offline: python -m pytest test_snapshot.py
+"""
+
+import numpy as np
+
+from snapshot import SnapshotStore
+
+def make_store(path, caches):
+    def collect():
+        return {'keys': sorted(caches)}, {key: np.asarray(value) for key, value in caches.items()}
+
+    def restore(document, arrays):
+        caches.update({key: arrays[key].tolist() for key in document['keys']})
+        return {'restored': len(document['keys']), 'stale': 0}
+
+    return SnapshotStore(str(path), collect, restore, interval=0)
+
+def test_saved_caches_are_restored(tmp_path):
+    path = tmp_path / 'snapshot.npz'
+    assert make_store(path, {'statevector/2': [1.0, 0.0]}).save()
+
+    restored = {}
+    store = make_store(path, restored)
+    assert store.load()
+    assert restored == {'statevector/2': [1.0, 0.0]}
+    assert store.stats()['restored_entries'] == 1
+
+def test_truncated_snapshot_is_a_cold_start(tmp_path):
+    path = tmp_path / 'snapshot.npz'
+    make_store(path, {'statevector/2': [1.0, 0.0]}).save()
+    path.write_bytes(path.read_bytes()[:40])
+
+    restored = {}
+    store = make_store(path, restored)
+    assert not store.load()
+    assert restored == {}
+    assert store.stats()['last_error'].startswith('load: ')
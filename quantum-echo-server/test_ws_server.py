@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the WebSocket channel (ws_server.py).
+Runs offline with an in-memory connection: python -m pytest test_ws_server.py
+"""
+
+from types import SimpleNamespace
+import asyncio
+import json
+
+import app as server
+from ws_server import WebSocketChannel
+
+class FakeConnection:
+    """Just enough of a websockets connection for handle_connection."""
+
+    def __init__(self, messages, headers=None, remote_addr='10.0.0.1', path='/'):
+        self.messages = [json.dumps(message) for message in messages]
+        self.remote_address = (remote_addr, 50000)
+        self.request = SimpleNamespace(path=path, headers=headers or {})
+        self.sent = []
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.messages:
+            # Let the handler tasks finish before the connection closes
+            await asyncio.sleep(0.05)
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+
+    async def send(self, data):
+        self.sent.append(json.loads(data))
+
+def client_ids(headers, trust_proxy, monkeypatch):
+    monkeypatch.setattr(server, 'TRUST_PROXY', trust_proxy)
+    seen = []
+    channel = WebSocketChannel({'echo': lambda message, client_id: (seen.append(client_id) or {}, 200)},
+                               identify=server.client_id_from)
+    connection = FakeConnection([{'id': '1', 'type': 'echo'}], headers=headers)
+    asyncio.run(channel.handle_connection(connection))
+    assert connection.sent[0]['status'] == 200
+    return seen
+
+def test_players_behind_a_trusted_proxy_get_their_own_client_id(monkeypatch):
+    headers = {'X-Forwarded-For': '203.0.113.7, 10.0.0.1'}
+    assert client_ids(headers, True, monkeypatch) == ['203.0.113.7']
+
+def test_forwarded_header_is_ignored_without_a_trusted_proxy(monkeypatch):
+    headers = {'X-Forwarded-For': '203.0.113.7'}
+    assert client_ids(headers, False, monkeypatch) == ['10.0.0.1']
+
+def test_server_channel_identifies_clients_like_http():
+    if server.websocket_channel is not None:
+        assert server.websocket_channel.identify is server.client_id_from
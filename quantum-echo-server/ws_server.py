@@ -0,0 +1,138 @@
+# ws_server.py
+# 🔌 PERSISTENT WEBSOCKET CHANNEL FOR DIALOGUE TRANSFORMATION
+#
+# Lets a game client keep one connection open per session instead of paying
+# connection setup (and a TLS handshake) for every HTTP request.
+#
+# Protocol (JSON text frames):
+#   client → {"id": "42", "type": "transform", "text": "...", "latency_budget_ms": 800}
+#   client → {"id": "43", "type": "gate", "gates": [{"gate": "hadamard", "target": 0}]}
+#   client → {"id": "44", "type": "prefetch", "steps": [...], "current": "s1"}
+#   server → {"id": "42", "type": "transform", "status": 200, "result": {...}}
+#
+# Messages carry the same fields as the /quantum_text, /quantum_gate and /prefetch bodies.
+# Results are pushed as soon as they are ready, so they may arrive out of order;
+# clients match them by id. Connecting with ?session_id=... applies that session
+# to every message that does not name one. Clients are identified from the
+# handshake headers, so behind a TLS proxy each player still gets their own
+# rate limit and prefetch group.
+#
+# Connections are served by a single asyncio event loop; only the quantum work
+# itself runs on a small thread pool, so idle connections cost no threads.
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+import asyncio
+import json
+import threading
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+class WebSocketChannel:
+    """Asyncio WebSocket server dispatching tagged messages to blocking handlers."""
+
+    def __init__(self, handlers, max_workers=4, max_pending=32, max_message_bytes=64 * 1024, identify=None):
+        # message type → handler(message, client_id) returning (result dict, status)
+        self.handlers = handlers
+        # (handshake headers, remote address) → client_id
+        self.identify = identify or (lambda headers, remote_addr: remote_addr or 'unknown')
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_message_bytes = max_message_bytes
+        self._executor = None
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.connections = 0
+        self.open_connections = 0
+        self.messages = 0
+        self.rejected = 0
+
+    def _count(self, field, delta=1):
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + delta)
+
+    async def handle_connection(self, websocket):
+        remote_addr = websocket.remote_address[0] if websocket.remote_address else None
+        client_id = self.identify(websocket.request.headers, remote_addr)
+        query = parse_qs(urlparse(websocket.request.path).query)
+        default_session = query.get('session_id', [None])[0]
+
+        self._count('connections')
+        self._count('open_connections')
+        pending = set()
+        try:
+            async for raw in websocket:
+                try:
+                    message = json.loads(raw)
+                    if not isinstance(message, dict):
+                        raise ValueError('message must be a JSON object')
+                except ValueError as e:
+                    self._count('rejected')
+                    await self._send(websocket, None, None, {'error': f'Invalid message: {e}'}, 400)
+                    continue
+
+                if len(pending) >= self.max_pending:
+                    self._count('rejected')
+                    await self._send(websocket, message.get('id'), message.get('type'),
+                                     {'error': 'Too many pending requests on this connection', 'retry_after': 1}, 429)
+                    continue
+
+                if default_session and 'session_id' not in message:
+                    message['session_id'] = default_session
+
+                self._count('messages')
+                task = asyncio.create_task(self._process(websocket, message, client_id))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        except ConnectionClosed:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            self._count('open_connections', -1)
+
+    async def _process(self, websocket, message, client_id):
+        request_id = message.get('id')
+        message_type = message.get('type')
+        handler = self.handlers.get(message_type)
+        if handler is None:
+            result, status = {'error': f"Unknown message type: {message_type!r}. Use: {', '.join(self.handlers)}"}, 400
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                result, status = await loop.run_in_executor(self._executor, handler, message, client_id)
+            except Exception as e:
+                print(f"[WebSocket] ❌ ERROR handling {message_type}: {e}")
+                result, status = {'error': str(e), 'debug_info': f'Exception type: {type(e).__name__}'}, 500
+        await self._send(websocket, request_id, message_type, result, status)
+
+    async def _send(self, websocket, request_id, message_type, result, status):
+        try:
+            await websocket.send(json.dumps({'id': request_id, 'type': message_type, 'status': status, 'result': result}))
+        except ConnectionClosed:
+            pass
+
+    async def _serve(self, host, port, ssl_context):
+        async with serve(self.handle_connection, host, port, ssl=ssl_context, max_size=self.max_message_bytes):
+            print(f"[WebSocket] 🔌 Listening on {'wss' if ssl_context else 'ws'}://{host}:{port}")
+            await asyncio.get_running_loop().create_future()
+
+    def start(self, host='0.0.0.0', port=8001, ssl_context=None):
+        """Run the server on its own event loop in a daemon thread (idempotent)."""
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='ws-quantum')
+            self._thread = threading.Thread(target=asyncio.run, args=(self._serve(host, port, ssl_context),),
+                                            name='websocket-channel', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'running': self._thread is not None,
+                'connections': self.connections,
+                'open_connections': self.open_connections,
+                'messages': self.messages,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for gunicorn and other WSGI servers:
+
+    gunicorn wsgi:app     # single worker, see gunicorn.conf.py
+
+Same app as app:app, but the worker also restores and saves the warm-start
+snapshot when QUANTUM_SNAPSHOT_PATH is set.
+"""
+
+from app import app, start_snapshots
+
+start_snapshots()